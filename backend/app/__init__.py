@@ -0,0 +1,4 @@
+import time
+
+# Taken when the package is first imported; app.main reports its import time against it
+IMPORT_STARTED = time.perf_counter()
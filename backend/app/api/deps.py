@@ -1,24 +1,35 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthCredentials
-from sqlalchemy.orm import Session
-from typing import Annotated
+import hmac
+import random
 
-from ..core.database import get_db
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, AsyncIterator
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal, get_db, read_session, write_session
+from ..core.profiling import RequestProfile, activate, log_profile
 from ..core.security import decode_access_token
-from ..models.user import User
+from ..services.admission import solver_admission, AdmissionRejected
+from ..services.principals import UserPrincipal, principal_cache, lookup_principal, cache_principal
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: Annotated[HTTPAuthCredentials, Depends(security)],
-    db: Annotated[Session, Depends(get_db)]
-) -> User:
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
+) -> UserPrincipal:
     """
     Dependency to get current authenticated user from JWT token.
+    Recently verified tokens are served from principal_cache; a database
+    session is only opened on a cache miss.
     """
     token = credentials.credentials
 
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     # Decode token
     payload = decode_access_token(token)
     if payload is None:
@@ -37,7 +48,8 @@ def get_current_user(
         )
 
     # Get user from database
-    user = db.query(User).filter(User.email == email).first()
+    async with AsyncSessionLocal() as db:
+        user = await db.run_sync(lookup_principal, payload)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,9 +57,94 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    cache_principal(token, payload, user)
     return user
 
 
+async def get_write_db(
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)]
+) -> AsyncIterator[AsyncSession]:
+    """
+    Dependency for routes that write on behalf of the current user.
+    Uses the primary; after a commit the user's reads stay on the primary
+    for a short while (see get_read_db).
+    """
+    async with write_session(current_user.id) as db:
+        yield db
+
+
+async def get_read_db(
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)]
+) -> AsyncIterator[AsyncSession]:
+    """
+    Dependency for read-only routes.
+    Uses the replica (DATABASE_READ_URL) unless the user committed through
+    get_write_db within DATABASE_READ_STICKY_SECONDS.
+    """
+    async with read_session(current_user.id) as db:
+        yield db
+
+
+async def acquire_solver_slot() -> AsyncIterator[int]:
+    """
+    Dependency that admits the request to the optimizer or sheds it.
+    Yields the solver timeout for this request and holds the slot until the
+    route returns.
+    """
+    try:
+        async with solver_admission.slot() as timeout:
+            yield timeout
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            status_code=exc.status_code,
+            detail=exc.detail,
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+
+PROFILE_HEADER = "X-Profile"
+
+
+def _may_profile(request: Request) -> bool:
+    """X-Profile carries PROFILING_TOKEN, or the bearer token belongs to a profiling admin."""
+    value = request.headers.get(PROFILE_HEADER)
+    if value is None:
+        return False
+    if settings.PROFILING_TOKEN and hmac.compare_digest(value, settings.PROFILING_TOKEN):
+        return True
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if not settings.PROFILING_ADMIN_EMAILS or scheme.lower() != "bearer":
+        return False
+    claims = decode_access_token(token)
+    return claims is not None and claims.get("sub") in settings.PROFILING_ADMIN_EMAILS
+
+
+async def get_request_profile(request: Request) -> AsyncIterator[RequestProfile | None]:
+    """
+    Dependency that profiles the request when PROFILING_ENABLED and the
+    caller may (see _may_profile); yields None otherwise.
+    The route adds the timings to its response (Server-Timing); they are
+    also logged when the route finishes.
+    """
+    if not settings.PROFILING_ENABLED or not _may_profile(request):
+        yield None
+        return
+
+    sampled = random.random() < settings.PROFILING_CPROFILE_RATE
+    profile = RequestProfile(dump_dir=settings.PROFILING_DUMP_DIR if sampled else None)
+    # Set within the request's own task, so the route and its run_sync calls see it
+    activate(profile)
+    try:
+        with profile.cprofile("api"):
+            yield profile
+    finally:
+        log_profile(profile, request.url.path)
+
+
 # Type alias for dependency injection
-CurrentUser = Annotated[User, Depends(get_current_user)]
-DatabaseSession = Annotated[Session, Depends(get_db)]
+CurrentUser = Annotated[UserPrincipal, Depends(get_current_user)]
+DatabaseSession = Annotated[AsyncSession, Depends(get_db)]
+WriteSession = Annotated[AsyncSession, Depends(get_write_db)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_db)]
+SolverTimeout = Annotated[int, Depends(acquire_solver_slot)]
+Profile = Annotated[RequestProfile | None, Depends(get_request_profile)]
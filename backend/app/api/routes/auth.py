@@ -3,19 +3,20 @@ from sqlalchemy.orm import Session
 
 from ...schemas.user import UserCreate, UserLogin, User, Token
 from ...models.user import User as UserModel
-from ...core.security import get_password_hash, verify_password, create_access_token
+from ...core.security import create_access_token
+from ...services.password_hasher import password_hasher, PasswordHasherBusy, PasswordHasherTimeout
 from ...api.deps import DatabaseSession, CurrentUser
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
-def register(user_in: UserCreate, db: DatabaseSession):
+async def register(user_in: UserCreate, db: DatabaseSession):
     """
     Register a new user.
     """
     # Check if user already exists
-    existing_user = db.query(UserModel).filter(UserModel.email == user_in.email).first()
+    existing_user = await db.run_sync(_get_user_by_email, user_in.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -23,36 +24,38 @@ def register(user_in: UserCreate, db: DatabaseSession):
         )
 
     # Create new user
-    hashed_password = get_password_hash(user_in.password)
-    db_user = UserModel(
-        email=user_in.email,
-        hashed_password=hashed_password
-    )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-
-    return db_user
+    hashed_password = await _run_hasher(password_hasher.hash(user_in.password))
+    return await db.run_sync(_create_user, user_in.email, hashed_password)
 
 
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: DatabaseSession):
+async def login(user_credentials: UserLogin, db: DatabaseSession):
     """
     Login and get access token.
     """
     # Get user from database
-    user = db.query(UserModel).filter(UserModel.email == user_credentials.email).first()
+    user = await db.run_sync(_get_user_by_email, user_credentials.email)
 
     # Verify credentials
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await _run_hasher(
+            password_hasher.verify(user_credentials.password, user.hashed_password)
+        )
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Upgrade the stored hash if BCRYPT_ROUNDS changed since it was made
+    if new_hash is not None:
+        await db.run_sync(_update_password_hash, user, new_hash)
+
     # Create access token
-    access_token = create_access_token(data={"sub": user.email})
+    access_token = create_access_token(data={"sub": user.email, "uid": user.id})
 
     return {
         "access_token": access_token,
@@ -66,3 +69,41 @@ def get_current_user_profile(current_user: CurrentUser):
     Get current user profile.
     """
     return current_user
+
+
+def _get_user_by_email(db: Session, email: str) -> UserModel | None:
+    return db.query(UserModel).filter(UserModel.email == email).first()
+
+
+def _create_user(db: Session, email: str, hashed_password: str) -> UserModel:
+    db_user = UserModel(
+        email=email,
+        hashed_password=hashed_password
+    )
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+
+def _update_password_hash(db: Session, user: UserModel, hashed_password: str) -> None:
+    user.hashed_password = hashed_password
+    db.commit()
+
+
+async def _run_hasher(call):
+    """Await password hashing, mapping hasher overload to HTTP errors."""
+    try:
+        return await call
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    except PasswordHasherTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Timed out verifying credentials, please retry",
+            headers={"Retry-After": "1"}
+        )
@@ -1,103 +1,97 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from ...schemas.budget import (
     BudgetProfileCreate,
     BudgetProfileUpdate,
     BudgetProfile as BudgetProfileSchema,
-    OptimizationResult as OptimizationResultSchema
+    OptimizationResult as OptimizationResultSchema,
+    OptimizationHistory as OptimizationHistorySchema
 )
-from ...models.budget import (
-    BudgetProfile as BudgetProfileModel,
-    FixedExpense,
-    VariableExpense,
-    FinancialGoal,
-    OptimizationResult
-)
-from ...api.deps import CurrentUser, DatabaseSession
+from ...models.budget import BudgetProfile as BudgetProfileModel
+from ...services.profiles import ProfileSnapshot, load_profile_snapshot, apply_profile_update
+from ...services.result_store import history_page
+from ...api.deps import CurrentUser, ReadSession, WriteSession
 
 router = APIRouter()
 
 
 @router.post("/", response_model=BudgetProfileSchema, status_code=status.HTTP_201_CREATED)
-def create_or_update_budget_profile(
+async def create_or_update_budget_profile(
     profile_in: BudgetProfileCreate,
     current_user: CurrentUser,
-    db: DatabaseSession
+    db: WriteSession
 ):
     """
     Create or update budget profile for current user.
-    If profile exists, it will be updated. Otherwise, a new one is created.
+    If profile exists, it is replaced by the given one. Otherwise, a new one is created.
     """
-    # Check if user already has a profile
-    existing_profile = db.query(BudgetProfileModel).filter(
-        BudgetProfileModel.user_id == current_user.id
-    ).first()
+    return await db.run_sync(_save_profile, current_user.id, profile_in)
 
-    if existing_profile:
-        # Update existing profile
-        existing_profile.monthly_income = profile_in.monthly_income
 
-        # Delete existing expenses and goals
-        db.query(FixedExpense).filter(FixedExpense.profile_id == existing_profile.id).delete()
-        db.query(VariableExpense).filter(VariableExpense.profile_id == existing_profile.id).delete()
-        db.query(FinancialGoal).filter(FinancialGoal.profile_id == existing_profile.id).delete()
+def _save_profile(db: Session, user_id: int, profile_in: BudgetProfileCreate) -> ProfileSnapshot:
+    # Check if user already has a profile
+    existing_profile = load_profile_snapshot(db, user_id)
 
-        profile = existing_profile
+    if existing_profile:
+        # Only write the expenses and goals that actually differ
+        apply_profile_update(db, existing_profile, existing_profile.id, profile_in)
     else:
         # Create new profile
         profile = BudgetProfileModel(
-            user_id=current_user.id,
+            user_id=user_id,
             monthly_income=profile_in.monthly_income
         )
         db.add(profile)
         db.flush()  # Get the profile ID
 
-    # Add fixed expenses
-    for expense in profile_in.fixed_expenses:
-        db_expense = FixedExpense(
-            profile_id=profile.id,
-            category=expense.category,
-            amount=expense.amount
-        )
-        db.add(db_expense)
-
-    # Add variable expenses
-    for expense in profile_in.variable_expenses:
-        db_expense = VariableExpense(
-            profile_id=profile.id,
-            category=expense.category,
-            min_amount=expense.min_amount,
-            max_amount=expense.max_amount
-        )
-        db.add(db_expense)
-
-    # Add financial goals
-    for goal in profile_in.financial_goals:
-        db_goal = FinancialGoal(
-            profile_id=profile.id,
-            name=goal.name,
-            target_amount=goal.target_amount,
-            current_amount=goal.current_amount,
-            deadline=goal.deadline,
-            priority=goal.priority
-        )
-        db.add(db_goal)
+        # Add expenses and goals
+        apply_profile_update(db, None, profile.id, profile_in)
 
     db.commit()
-    db.refresh(profile)
+
+    return load_profile_snapshot(db, user_id)
+
+
+@router.patch("/", response_model=BudgetProfileSchema)
+async def update_budget_profile(
+    profile_in: BudgetProfileUpdate,
+    current_user: CurrentUser,
+    db: WriteSession
+):
+    """
+    Partially update current user's budget profile.
+    Omitted fields are left unchanged; a given expense or goal list replaces
+    the stored one, touching only the entries that differ.
+    """
+    profile = await db.run_sync(_update_profile, current_user.id, profile_in)
+
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Budget profile not found. Please create one first."
+        )
 
     return profile
 
 
+def _update_profile(db: Session, user_id: int, profile_in: BudgetProfileUpdate) -> ProfileSnapshot | None:
+    profile = load_profile_snapshot(db, user_id)
+
+    if not profile or not apply_profile_update(db, profile, profile.id, profile_in):
+        return profile
+
+    db.commit()
+
+    return load_profile_snapshot(db, user_id)
+
+
 @router.get("/", response_model=BudgetProfileSchema)
-def get_budget_profile(current_user: CurrentUser, db: DatabaseSession):
+async def get_budget_profile(current_user: CurrentUser, db: ReadSession):
     """
     Get current user's budget profile.
     """
-    profile = db.query(BudgetProfileModel).filter(
-        BudgetProfileModel.user_id == current_user.id
-    ).first()
+    profile = await db.run_sync(load_profile_snapshot, current_user.id)
 
     if not profile:
         raise HTTPException(
@@ -108,23 +102,54 @@ def get_budget_profile(current_user: CurrentUser, db: DatabaseSession):
     return profile
 
 
-@router.get("/history", response_model=list[OptimizationResultSchema])
-def get_optimization_history(current_user: CurrentUser, db: DatabaseSession):
+@router.get("/history", response_model=OptimizationHistorySchema)
+async def get_optimization_history(
+    current_user: CurrentUser,
+    db: ReadSession,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = None,
+    include_result: bool = False
+):
     """
-    Get historical optimization results for current user.
+    Get historical optimization results for current user, newest first.
+    Items carry summary fields only unless include_result is set; pass
+    next_cursor back as cursor to get the following page.
     """
-    profile = db.query(BudgetProfileModel).filter(
-        BudgetProfileModel.user_id == current_user.id
-    ).first()
+    try:
+        items, next_cursor = await db.run_sync(history_page, current_user.id, limit, cursor, include_result)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
 
-    if not profile:
+    # Only an empty first page needs to tell "no results" from "no profile"
+    if not items and cursor is None and not await db.run_sync(_has_profile, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Budget profile not found"
         )
 
-    results = db.query(OptimizationResult).filter(
-        OptimizationResult.profile_id == profile.id
-    ).order_by(OptimizationResult.created_at.desc()).limit(10).all()
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/history/{result_id}", response_model=OptimizationResultSchema)
+async def get_optimization_result(result_id: int, current_user: CurrentUser, db: ReadSession):
+    """
+    Get one historical optimization result including its full payload.
+    """
+    items, _ = await db.run_sync(history_page, current_user.id, 1, include_result=True, result_id=result_id)
+
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Optimization result not found"
+        )
+
+    return items[0]
+
 
-    return results
+def _has_profile(db: Session, user_id: int) -> bool:
+    return db.query(
+        db.query(BudgetProfileModel).filter(BudgetProfileModel.user_id == user_id).exists()
+    ).scalar()
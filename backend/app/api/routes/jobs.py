@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+from ...core.database import AsyncSessionLocal
+from ...schemas.job import JobCreate, Job
+from ...models.job import OptimizationJob
+from ...services.jobs import enqueue_job, cancel_job, TERMINAL_STATUSES
+from ...api.deps import CurrentUser, DatabaseSession, WriteSession
+
+router = APIRouter()
+
+# Seconds between keep-alive comments on an idle event stream
+_KEEPALIVE_INTERVAL = 15.0
+
+
+@router.post("/", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(job_in: JobCreate, current_user: CurrentUser, db: WriteSession):
+    """
+    Enqueue an optimization, scenario or batch scenario job.
+    Poll GET /jobs/{id} or stream GET /jobs/{id}/events for the result.
+    """
+    payload = {
+        "optimize": job_in.optimization,
+        "scenario": job_in.scenario,
+        "scenario_batch": job_in.batch
+    }[job_in.kind]
+
+    return await db.run_sync(enqueue_job, current_user.id, job_in.kind, payload.model_dump(mode="json"))
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str, current_user: CurrentUser, db: DatabaseSession):
+    """
+    Get job status, progress and, once finished, its result.
+    """
+    return await db.run_sync(_get_user_job, job_id, current_user.id)
+
+
+@router.post("/{job_id}/cancel", response_model=Job)
+async def cancel(job_id: str, current_user: CurrentUser, db: WriteSession):
+    """
+    Cancel a queued or running job.
+    """
+    return await db.run_sync(_cancel_user_job, job_id, current_user.id)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, current_user: CurrentUser):
+    """
+    Server-sent events for a job: "progress" events while it is queued or
+    running, then one "complete" event carrying the final job and the stream
+    closes. The job is re-read every JOB_EVENT_INTERVAL seconds after a
+    change, backing off to JOB_EVENT_MAX_INTERVAL while nothing changes.
+    """
+    await _load_job_state(job_id, current_user.id)
+
+    async def events():
+        last_state = None
+        idle = 0.0
+        interval = settings.JOB_EVENT_INTERVAL
+        while True:
+            job = await _load_job_state(job_id, current_user.id)
+            state = (job.status, job.progress)
+
+            if job.status in TERMINAL_STATUSES:
+                yield f"event: complete\ndata: {job.model_dump_json()}\n\n"
+                return
+
+            if state != last_state:
+                data = json.dumps({"id": job.id, "status": job.status, "progress": job.progress})
+                yield f"event: progress\ndata: {data}\n\n"
+                last_state = state
+                idle = 0.0
+                interval = settings.JOB_EVENT_INTERVAL
+            else:
+                if idle >= _KEEPALIVE_INTERVAL:
+                    yield ": keep-alive\n\n"
+                    idle = 0.0
+                interval = min(interval * 2, settings.JOB_EVENT_MAX_INTERVAL)
+
+            await asyncio.sleep(interval)
+            idle += interval
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _get_user_job(db: Session, job_id: str, user_id: int) -> OptimizationJob:
+    job = db.query(OptimizationJob).filter(
+        OptimizationJob.id == job_id,
+        OptimizationJob.user_id == user_id
+    ).first()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job
+
+
+def _cancel_user_job(db: Session, job_id: str, user_id: int) -> OptimizationJob:
+    return cancel_job(db, _get_user_job(db, job_id, user_id))
+
+
+async def _load_job_state(job_id: str, user_id: int) -> Job:
+    # The stream outlives the request's session, so each poll opens its own
+    async with AsyncSessionLocal() as db:
+        job = await db.run_sync(_get_user_job, job_id, user_id)
+        return Job.model_validate(job)
@@ -1,153 +1,280 @@
-from fastapi import APIRouter, HTTPException, status
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from ...core.config import settings
+from ...core.profiling import RequestProfile, current_profile, phase, run_profiled
+from ...core.responses import FastJSONResponse
+from ...core.tracing import span, traced
 from ...schemas.optimization import (
     OptimizationRequest,
     OptimizationResponse,
-    ScenarioRequest
+    optimization_response_content,
+    ScenarioRequest,
+    BatchScenarioRequest,
+    BatchScenarioResponse,
+    SensitivityRequest,
+    SensitivityResponse,
+    SensitivityPoint
+)
+from ...services.admission import solver_admission
+from ...services.optimizer import (
+    optimize_budget,
+    result_cache,
+    canonical_problem,
+    problem_hash,
+    optimize_budget_batch,
+    generate_recommendations
 )
-from ...models.budget import (
-    BudgetProfile,
-    OptimizationResult as OptimizationResultModel
+from ...services.profiles import (
+    load_optimization_inputs,
+    load_profile_snapshot,
+    ProfileNotFound,
+    GoalNotFound
 )
-from ...services.optimizer import optimize_budget, generate_recommendations
-from ...api.deps import CurrentUser, DatabaseSession
+from ...services.password_hasher import password_hasher
+from ...services.principals import principal_cache_stats
+from ...services.result_store import find_solved_result, latest_result, store_result
+from ...services.scenarios import scenario_inputs, expand_batch, batch_response
+from ...services.sensitivity import savings_curve
+from ...services.slow_solves import record_solve
+from ...services.solver_pool import solver_pool, SolverPoolBusy, SolverPoolTimeout
+from ...api.deps import CurrentUser, Profile, ReadSession, WriteSession, SolverTimeout, acquire_solver_slot
 
 router = APIRouter()
 
 
 @router.post("/", response_model=OptimizationResponse)
-def run_optimization(
+@traced("run_optimization")
+async def run_optimization(
     request: OptimizationRequest,
     current_user: CurrentUser,
-    db: DatabaseSession
+    db: WriteSession,
+    solver_timeout: SolverTimeout,
+    profile: Profile
 ):
     """
     Run budget optimization using current user's profile.
     """
-    # Get user's budget profile
-    profile = db.query(BudgetProfile).filter(
-        BudgetProfile.user_id == current_user.id
-    ).first()
-
-    if not profile:
+    try:
+        with phase("profile_load"), span("load_optimization_inputs"):
+            profile_id, inputs = await db.run_sync(
+                load_optimization_inputs, current_user.id, request.optimization_mode, request.goal_id
+            )
+    except ProfileNotFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Budget profile not found. Please create one first."
         )
+    except GoalNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Financial goal not found"
+        )
 
-    # Prepare data for optimization
-    monthly_income = float(profile.monthly_income)
+    # Reuse a stored result if this exact problem was solved before
+    problem = canonical_problem(**inputs)
+    problem_digest = problem_hash(problem)
+    with phase("result_lookup"), span("find_solved_result"):
+        result = await db.run_sync(
+            find_solved_result, problem_digest, inputs["fixed_expenses"], inputs["variable_categories"]
+        )
 
-    fixed_expenses = {
-        expense.category: float(expense.amount)
-        for expense in profile.fixed_expenses
-    }
+    if result is None:
+        # Run optimization
+        with span("optimize_budget", **_solve_attributes(inputs)) as solve_span:
+            started = time.perf_counter()
+            result = await _run_solver(optimize_budget, **inputs, timeout=solver_timeout)
+            record_solve(inputs, result, time.perf_counter() - started)
+            if solve_span is not None:
+                solve_span.attributes["optimizer.status"] = result["status"]
 
-    variable_categories = {
-        expense.category: (float(expense.min_amount), float(expense.max_amount))
-        for expense in profile.variable_expenses
+    # Save result to database if successful
+    if result["status"] == "optimal":
+        with phase("db_write"), span("store_result"):
+            await db.run_sync(_save_result, profile_id, result, problem_digest)
+
+    return _respond(optimization_response_content(result), profile)
+
+
+def _save_result(db: Session, profile_id: int, result: dict, problem_digest: str) -> None:
+    store_result(db, profile_id, result, problem_digest)
+    with span("db.commit"):
+        db.commit()
+
+
+def _solve_attributes(inputs: dict) -> dict:
+    return {
+        "optimizer.mode": inputs["optimization_mode"],
+        "optimizer.engine": settings.SOLVER_ENGINE,
+        "optimizer.categories": len(inputs["variable_categories"]),
+        "optimizer.months": inputs["months_to_goal"],
     }
 
-    # Determine savings goal
-    savings_goal = 0
-    months_to_goal = 12
 
-    if request.goal_id:
-        # Optimize for specific goal
-        goal = next(
-            (g for g in profile.financial_goals if g.id == request.goal_id),
-            None
-        )
-        if not goal:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Financial goal not found"
-            )
-        savings_goal = float(goal.target_amount - goal.current_amount)
-
-        if goal.deadline:
-            from datetime import datetime
-            months_diff = (goal.deadline.year - datetime.now().year) * 12 + \
-                         (goal.deadline.month - datetime.now().month)
-            months_to_goal = max(1, months_diff)
-    else:
-        # Use highest priority goal if no specific goal requested
-        if profile.financial_goals:
-            top_goal = max(profile.financial_goals, key=lambda g: g.priority)
-            savings_goal = float(top_goal.target_amount - top_goal.current_amount)
-
-            if top_goal.deadline:
-                from datetime import datetime
-                months_diff = (top_goal.deadline.year - datetime.now().year) * 12 + \
-                             (top_goal.deadline.month - datetime.now().month)
-                months_to_goal = max(1, months_diff)
+def _respond(content: dict, profile: RequestProfile | None) -> FastJSONResponse:
+    """Render the body; a profiled request gets its timings as Server-Timing and X-Profile-Id."""
+    with phase("encode"):
+        response = FastJSONResponse(content)
+    if profile is not None:
+        response.headers["Server-Timing"] = profile.server_timing()
+        response.headers["X-Profile-Id"] = profile.id
+    return response
 
-    # Run optimization
-    result = optimize_budget(
-        monthly_income=monthly_income,
-        fixed_expenses=fixed_expenses,
-        variable_categories=variable_categories,
-        savings_goal=savings_goal,
-        months_to_goal=months_to_goal,
-        optimization_mode=request.optimization_mode
-    )
 
-    # Save result to database if successful
-    if result["status"] == "optimal":
-        opt_result = OptimizationResultModel(
-            profile_id=profile.id,
-            result_json=result
+async def _run_solver(fn, *args, task_timeout: float | None = None, **kwargs):
+    """
+    Run solver work in the solver pool, mapping pool overload to HTTP errors.
+    For a profiled request the worker records its own phases, which are
+    merged into the request's profile.
+    """
+    profile = current_profile()
+    try:
+        if profile is None:
+            return await solver_pool.run(fn, *args, task_timeout=task_timeout, **kwargs)
+        with profile.phase("solver_call"):
+            result, phases, dumps = await solver_pool.run(
+                run_profiled, fn, args, kwargs, profile.id, profile.dump_dir, task_timeout=task_timeout
+            )
+        for name, seconds in phases.items():
+            profile.add(name, seconds)
+        profile.dumps.extend(dumps)
+        return result
+    except SolverPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Optimizer is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    except SolverPoolTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Optimization timed out"
+        )
+    except BrokenProcessPool:
+        # The pool is replaced on the next request
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Optimizer restarted, please retry",
+            headers={"Retry-After": "1"}
         )
-        db.add(opt_result)
-        db.commit()
-
-    return OptimizationResponse(**result)
 
 
 @router.post("/scenario", response_model=OptimizationResponse)
-def run_scenario_analysis(request: ScenarioRequest):
+@traced("run_scenario_analysis")
+async def run_scenario_analysis(request: ScenarioRequest, solver_timeout: SolverTimeout, profile: Profile):
     """
     Run what-if scenario analysis without saving to database.
     Allows users to test different income/expense scenarios.
     """
-    # Convert Decimal to float for optimization
-    monthly_income = float(request.monthly_income)
+    # Run optimization
+    inputs = scenario_inputs(request)
+    with span("optimize_budget", **_solve_attributes(inputs)):
+        started = time.perf_counter()
+        result = await _run_solver(optimize_budget, **inputs, timeout=solver_timeout)
+        record_solve(inputs, result, time.perf_counter() - started)
 
-    fixed_expenses = {
-        cat: float(amt) for cat, amt in request.fixed_expenses.items()
-    }
+    return _respond(optimization_response_content(result), profile)
 
-    variable_categories = {
-        cat: (float(bounds[0]), float(bounds[1]))
-        for cat, bounds in request.variable_categories.items()
-    }
 
-    savings_goal = float(request.savings_goal)
-    months_to_goal = request.months_to_goal
+@router.post("/scenario/batch", response_model=BatchScenarioResponse)
+@traced("run_batch_scenario_analysis")
+async def run_batch_scenario_analysis(
+    request: BatchScenarioRequest,
+    solver_timeout: SolverTimeout,
+    profile: Profile
+):
+    """
+    Run many what-if scenarios in one request without saving to database.
+    Accepts either a list of scenarios or a base scenario plus a list of deltas.
+    Results are returned in input order; scenarios that fail validation, error
+    out or are not reached within the time budget are reported with status
+    "error" without failing the batch.
+    """
+    start = time.perf_counter()
+    scenarios = expand_batch(request)
+
+    if len(scenarios) > settings.SCENARIO_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch too large: at most {settings.SCENARIO_BATCH_MAX_SIZE} scenarios per request"
+        )
 
-    # Run optimization
-    result = optimize_budget(
-        monthly_income=monthly_income,
-        fixed_expenses=fixed_expenses,
-        variable_categories=variable_categories,
-        savings_goal=savings_goal,
-        months_to_goal=months_to_goal,
-        optimization_mode=request.optimization_mode
+    time_budget = settings.SCENARIO_BATCH_TIME_BUDGET
+    if request.time_budget is not None:
+        time_budget = min(time_budget, request.time_budget)
+
+    # Solve only the scenarios that resolved to valid inputs
+    solved = await _run_solver(
+        optimize_budget_batch,
+        [scenario_inputs(scenario) for scenario in scenarios if isinstance(scenario, ScenarioRequest)],
+        time_budget=time_budget,
+        timeout=solver_timeout,
+        max_workers=settings.SCENARIO_BATCH_WORKERS,
+        chunk_size=settings.SCENARIO_BATCH_CHUNK_SIZE,
+        task_timeout=time_budget + settings.SOLVER_POOL_TASK_TIMEOUT
     )
 
-    return OptimizationResponse(**result)
+    return _respond(batch_response(scenarios, solved, time.perf_counter() - start), profile)
+
+
+@router.post(
+    "/sensitivity",
+    response_model=SensitivityResponse,
+    dependencies=[Depends(acquire_solver_slot)]
+)
+def run_sensitivity_analysis(request: SensitivityRequest):
+    """
+    Compute optimal savings as a piecewise-linear function of monthly income
+    or of one fixed expense, without re-solving per point.
+    Returns the curve's breakpoints with the allocation at each, plus the
+    optimal plan at any requested parameter values.
+    """
+    try:
+        curve = savings_curve(**scenario_inputs(request), parameter=request.parameter)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+    def point(value: float, evaluated: tuple[float, dict[str, float]] | None) -> SensitivityPoint:
+        if evaluated is None:
+            return SensitivityPoint(value=round(value, 2), status="infeasible")
+        savings, allocation = evaluated
+        return SensitivityPoint(
+            value=round(value, 2),
+            status="optimal",
+            monthly_savings=round(savings, 2),
+            spending_allocation={cat: round(amt, 2) for cat, amt in allocation.items()}
+        )
+
+    limit = curve.feasibility_limit
+    return SensitivityResponse(
+        parameter=request.parameter,
+        feasibility_limit=round(limit, 2) if limit is not None else None,
+        breakpoints=[
+            point(value, (savings, allocation))
+            for value, savings, allocation in curve.breakpoints()
+        ],
+        tail_slope=curve.direction,
+        points=[point(float(value), curve.evaluate(float(value))) for value in request.points]
+    )
 
 
 @router.get("/recommendations", response_model=list[str])
-def get_recommendations(current_user: CurrentUser, db: DatabaseSession):
+async def get_recommendations(current_user: CurrentUser, db: ReadSession):
     """
     Get AI-generated savings recommendations based on spending patterns.
     """
+    return await db.run_sync(_recommendations, current_user.id)
+
+
+def _recommendations(db: Session, user_id: int) -> list[str]:
     # Get user's budget profile
-    profile = db.query(BudgetProfile).filter(
-        BudgetProfile.user_id == current_user.id
-    ).first()
+    profile = load_profile_snapshot(db, user_id)
 
     if not profile:
         raise HTTPException(
@@ -156,18 +283,14 @@ def get_recommendations(current_user: CurrentUser, db: DatabaseSession):
         )
 
     # Get latest optimization result
-    latest_result = db.query(OptimizationResultModel).filter(
-        OptimizationResultModel.profile_id == profile.id
-    ).order_by(OptimizationResultModel.created_at.desc()).first()
+    result_data = latest_result(db, profile.id)
 
-    if not latest_result:
+    if result_data is None:
         return [
             "Run an optimization first to get personalized recommendations!",
             "Make sure to set your financial goals for better insights."
         ]
 
-    result_data = latest_result.result_json
-
     if result_data.get("status") != "optimal":
         return [
             "Your current budget is infeasible. Consider adjusting your income, expenses, or goals.",
@@ -196,3 +319,20 @@ def get_recommendations(current_user: CurrentUser, db: DatabaseSession):
         "Your budget looks well-optimized!",
         "Keep tracking your expenses and adjusting as needed."
     ]
+
+
+@router.get("/status")
+def get_optimizer_status(current_user: CurrentUser):
+    """
+    Report optimizer load for monitoring: admission limiter, solver pool,
+    result cache, authentication cache and password hasher state. Cache counters cover this
+    process only; solver pool workers keep their own caches.
+    Requires authentication; unauthenticated scrapers use /metrics.
+    """
+    return {
+        "admission": solver_admission.stats(),
+        "solver_pool": solver_pool.stats(),
+        "result_cache": result_cache.stats(),
+        "auth_cache": principal_cache_stats(),
+        "password_hasher": password_hasher.stats()
+    }
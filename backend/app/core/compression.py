@@ -0,0 +1,136 @@
+import zlib
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Content types sent as they are produced; buffering them would stall the client
+_UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+class _Encoder:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits 16 + MAX_WBITS writes the gzip header and trailer
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data)
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish() if self.encoding == "br" else self._compressor.flush()
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick "br" or "gzip" from an Accept-Encoding header, preferring brotli."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for encoding in ("br", "gzip"):
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, whichever the client accepts.
+
+    Bodies smaller than minimum_size are sent as they are, as are responses
+    that already have a Content-Encoding or are event streams.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, self.minimum_size, _Encoder(encoding, self.gzip_level, self.brotli_quality))
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, minimum_size: int, encoder: _Encoder):
+        self._send = send
+        self.minimum_size = minimum_size
+        self.encoder = encoder
+        self.start_message: Message | None = None
+        self.passthrough = False
+        self.compressing = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Headers wait for the first body chunk, which decides the encoding
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith(_UNCOMPRESSED_TYPES)
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if self.passthrough or (not more_body and len(body) < self.minimum_size):
+                await self._send(start)
+                await self._send(message)
+                self.passthrough = True
+                return
+
+            self.compressing = True
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.encoder.encoding
+            headers.add_vary_header("Accept-Encoding")
+            body = self.encoder.compress(body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body += self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        if not self.compressing:
+            await self._send(message)
+            return
+
+        body = self.encoder.compress(body)
+        if not more_body:
+            body += self.encoder.finish()
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -15,14 +15,80 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "postgresql://postgres:postgres@db:5432/finance_optimizer"
+    DATABASE_CONNECT_TIMEOUT: int = 5  # seconds; schema is managed by Alembic (alembic upgrade head)
+    DATABASE_POOL_SIZE: int = 10  # persistent connections per engine and process
+    DATABASE_MAX_OVERFLOW: int = 10  # extra connections opened under load, closed when returned
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DATABASE_POOL_TIMEOUT: float = 10.0  # seconds to wait for a free connection
+    DATABASE_STATEMENT_TIMEOUT: float = 15.0  # seconds per query on the request (async) engine
+    DATABASE_READ_URL: Optional[str] = None  # replica for read-only routes; unset reads the primary
+    DATABASE_READ_STICKY_SECONDS: float = 5.0  # reads stay on the primary this long after a user's write
+    DATABASE_READ_STICKY_USERS: int = 10000  # recent writers tracked per process
 
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production-please"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    BCRYPT_ROUNDS: int = 12  # existing hashes are upgraded on the next successful login
+    PASSWORD_HASH_WORKERS: int = 2  # threads dedicated to bcrypt
+    PASSWORD_HASH_QUEUE_DEPTH: int = 32  # hashes waiting for a thread before requests are shed
+    PASSWORD_HASH_TIMEOUT: float = 5.0  # seconds, including queue wait
+    AUTH_CACHE_SIZE: int = 10000  # authenticated tokens cached per process, 0 disables
+    AUTH_CACHE_TTL: float = 60.0  # seconds, bounds staleness across processes
+
+    # Responses
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent uncompressed
+    RESPONSE_GZIP_LEVEL: int = 6
+    RESPONSE_BROTLI_QUALITY: int = 4  # 0-11; higher compresses better but costs CPU per response
 
     # Optimization settings
-    SOLVER_TIMEOUT: int = 10  # seconds
+    SOLVER_TIMEOUT: int = 10  # seconds, with an empty admission queue
+    SOLVER_MIN_TIMEOUT: int = 2  # seconds, with a full admission queue
+    SOLVER_MAX_CONCURRENCY: int = 4  # requests doing solver work at once
+    SOLVER_MAX_QUEUE: int = 64  # requests allowed to wait for a slot
+    SOLVER_MAX_QUEUE_WAIT: float = 10.0  # seconds
+    SOLVER_ENGINE: Literal["closed_form", "pulp", "highs"] = "closed_form"  # see app/services/solvers.py
+    SOLVER_POOL_SIZE: int = 2  # worker processes, 0 solves in the request threadpool
+    SOLVER_POOL_QUEUE_DEPTH: int = 32  # tasks allowed to wait for a worker
+    SOLVER_POOL_TASK_TIMEOUT: float = 15.0  # seconds
+    OPTIMIZER_CACHE_SIZE: int = 1024  # memoized results per process, 0 disables
+    OPTIMIZER_CACHE_TTL: float = 300.0  # seconds
+    SCENARIO_BATCH_MAX_SIZE: int = 5000
+    SCENARIO_BATCH_TIME_BUDGET: float = 30.0  # seconds, upper bound for a whole batch
+    SCENARIO_BATCH_WORKERS: int = 4
+    SCENARIO_BATCH_CHUNK_SIZE: int = 64  # scenarios per worker task
+
+    # Per-request profiling of /api/optimize routes (app.core.profiling)
+    PROFILING_ENABLED: bool = False  # when off the X-Profile header is ignored
+    PROFILING_TOKEN: Optional[str] = None  # X-Profile value that profiles any request
+    PROFILING_ADMIN_EMAILS: list[str] = []  # users whose requests with any X-Profile value are profiled
+    PROFILING_CPROFILE_RATE: float = 0.0  # fraction of profiled requests that also write cProfile dumps
+    PROFILING_DUMP_DIR: str = "/tmp/finance-optimizer-profiles"
+
+    # Span tracing and slow-solve capture (app.core.tracing, app.services.slow_solves)
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 1.0  # fraction of requests traced; an incoming traceparent decides for itself
+    TRACING_FILE: str = "traces/spans-{pid}.jsonl"
+    TRACING_MAX_BYTES: int = 50 * 1024 * 1024  # per file before rotating, for spans and slow solves
+    TRACING_BACKUP_COUNT: int = 5  # rotated files kept
+    SLOW_SOLVE_SECONDS: float = 2.0  # solves at least this slow have their problem captured, 0 disables
+    SLOW_SOLVE_FILE: str = "traces/slow-solves-{pid}.jsonl"
+
+    # Background optimization jobs
+    JOB_WORKERS: int = 2  # worker threads per process, 0 disables the runner
+    JOB_POLL_INTERVAL: float = 2.0  # seconds between queue polls when idle
+    JOB_STALE_AFTER: float = 60.0  # seconds without heartbeat before a running job is requeued
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_BATCH_MAX_SIZE: int = 100000
+    JOB_BATCH_TIME_BUDGET: float = 600.0  # seconds
+    JOB_PROGRESS_CHUNK_SIZE: int = 500  # scenarios between progress updates
+    JOB_SOLVER_CONCURRENCY: int = 1  # solves running at once across a process's job workers
+    JOB_EVENT_INTERVAL: float = 0.5  # seconds between job state checks on event streams, right after a change
+    JOB_EVENT_MAX_INTERVAL: float = 5.0  # the check interval doubles while a job's state is unchanged, up to this
+
+    # Nightly bulk re-optimization (app.services.reoptimize)
+    REOPTIMIZE_CHUNK_SIZE: int = 500  # profiles streamed, solved and inserted per chunk
+    REOPTIMIZE_WORKERS: int = 4  # solver processes, 0 solves in-process
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,18 +1,118 @@
-from sqlalchemy import create_engine
+from typing import AsyncIterator
+
+from sqlalchemy import JSON, create_engine, event, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from .cache import TTLCache
 from .config import settings
+from .metrics import instrument_engine, timed_pool_class
+
+
+def async_database_url(url: str) -> str:
+    """The asyncio-driver form of a sync DATABASE_URL: asyncpg for Postgres, aiosqlite for SQLite."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    driver = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}.get(dialect, scheme)
+    return f"{driver}{sep}{rest}"
+
+
+def _pool_options(url: str, pool_class: type, role: str) -> dict:
+    # Pool sizing (and checkout wait metrics) apply to Postgres; SQLite engines keep SQLAlchemy's defaults
+    if not url.startswith("postgresql"):
+        return {}
+    return {
+        "poolclass": timed_pool_class(pool_class, role),
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+    }
+
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+def _create_request_engine(url: str, role: str) -> AsyncEngine:
+    """Async engine for request handling; statement_timeout bounds every request query."""
+    request_engine = create_async_engine(
+        async_database_url(url),
+        pool_pre_ping=True,
+        connect_args={
+            "timeout": settings.DATABASE_CONNECT_TIMEOUT,
+            "server_settings": {"statement_timeout": str(int(settings.DATABASE_STATEMENT_TIMEOUT * 1000))}
+        } if url.startswith("postgresql") else {},
+        **_pool_options(url, AsyncAdaptedQueuePool, role)
+    )
+    instrument_engine(request_engine.sync_engine, role)
+    return request_engine
+
+
+# Sync engine for batch work (job runner, nightly re-optimization, migrations).
+# Connecting is deferred to the first checkout; nothing here touches the database
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
+    connect_args={"connect_timeout": settings.DATABASE_CONNECT_TIMEOUT}
+    if settings.DATABASE_URL.startswith("postgresql") else {},
+    **_pool_options(settings.DATABASE_URL, QueuePool, "batch")
+)
+instrument_engine(engine, "batch")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = _create_request_engine(settings.DATABASE_URL, "primary")
+# Objects stay readable after commit: expired attributes cannot lazy-load outside run_sync
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Read-only routes use the replica when DATABASE_READ_URL is set, the primary otherwise
+read_engine = _create_request_engine(settings.DATABASE_READ_URL, "replica") if settings.DATABASE_READ_URL else async_engine
+ReadSessionLocal = async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False)
+
+# User id -> True for users who committed on the primary within the sticky
+# window; their reads stay on the primary so they see their own writes
+recent_writers = TTLCache(maxsize=settings.DATABASE_READ_STICKY_USERS, ttl=settings.DATABASE_READ_STICKY_SECONDS)
+
 Base = declarative_base()
 
+# JSON column type: JSONB on Postgres, plain JSON elsewhere (SQLite stand-ins)
+PortableJSON = JSON().with_variant(JSONB(), "postgresql")
 
-def get_db():
-    """Dependency for getting database session."""
-    db = SessionLocal()
-    try:
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency for getting an async database session.
+
+    Sync service functions run on it through ``await db.run_sync(fn, ...)``,
+    which drives them on the event loop instead of a threadpool thread.
+    """
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def write_session(user_id: int) -> AsyncSession:
+    """
+    Primary session on behalf of a user; a commit makes the user's reads
+    stick to the primary for DATABASE_READ_STICKY_SECONDS.
+    """
+    db = AsyncSessionLocal()
+    db.info["user_id"] = user_id
+    return db
+
+
+def read_session(user_id: int) -> AsyncSession:
+    """Replica session for a user, or a primary one if the user wrote recently."""
+    if read_engine is async_engine or recent_writers.get(user_id):
+        return AsyncSessionLocal()
+    return ReadSessionLocal()
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if user_id is not None:
+        recent_writers.set(user_id, True)
+
+
+async def check_database() -> None:
+    """Open a pooled connection and run a trivial query; raises if the database is unreachable."""
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
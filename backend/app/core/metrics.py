@@ -0,0 +1,288 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Served by GET /metrics; nothing is pushed anywhere. Values are per process,
+so scrape every worker. Label values come from fixed sets (route templates,
+HTTP methods, status classes, solver modes and statuses, size buckets, pool
+roles) and every metric additionally folds series beyond MAX_SERIES into a
+single "other" series, so cardinality stays bounded whatever the traffic.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Series per metric before new label combinations are folded into "other"
+MAX_SERIES = 500
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_HTTP_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+# Variable-category counts bucketed into the model size label
+_SIZE_BUCKETS = ((5, "0-5"), (20, "6-20"), (100, "21-100"), (500, "101-500"))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._series: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        # Called with the lock held
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        if key not in self._series and len(self._series) >= MAX_SERIES:
+            key = ("other",) * len(self.labelnames)
+        return key
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(
+            f"{name}{_format_labels(labels)} {_format_value(value)}"
+            for name, labels, value in self.samples()
+        )
+        return "\n".join(lines)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: object) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            key = self._key(labels)
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (last one is +Inf), sum, count
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            series = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items()]
+        for key, (counts, total, count) in series:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class Gauge(_Metric):
+    """Gauge read from a callback at scrape time; the callback returns {label values: value}."""
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], dict[tuple[str, ...], float]],
+        labelnames: tuple[str, ...] = ()
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.read = read
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        for key, value in list(self.read().items())[:MAX_SERIES]:
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status class.",
+    ("route", "method", "status")
+))
+REQUEST_DB_QUERIES = registry.register(Histogram(
+    "http_request_db_queries",
+    "Database queries issued while handling one request.",
+    ("route",),
+    buckets=COUNT_BUCKETS
+))
+REQUEST_DB_SECONDS = registry.register(Histogram(
+    "http_request_db_duration_seconds",
+    "Total database query time spent handling one request.",
+    ("route",)
+))
+DB_QUERY_SECONDS = registry.register(Histogram(
+    "db_query_duration_seconds",
+    "Duration of individual database queries by engine.",
+    ("engine",),
+    buckets=QUERY_BUCKETS
+))
+DB_POOL_WAIT_SECONDS = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection.",
+    ("pool",),
+    buckets=QUERY_BUCKETS
+))
+SOLVE_SECONDS = registry.register(Histogram(
+    "optimizer_solve_duration_seconds",
+    "optimize_budget time as seen by the caller, by mode, result status and variable-category count.",
+    ("mode", "status", "size")
+))
+
+
+def model_size_label(n_categories: int) -> str:
+    for bound, label in _SIZE_BUCKETS:
+        if n_categories <= bound:
+            return label
+    return f">{_SIZE_BUCKETS[-1][0]}"
+
+
+def observe_solve(inputs: dict, result: dict, seconds: float) -> None:
+    """Record one optimize_budget call made with the given keyword arguments."""
+    SOLVE_SECONDS.observe(
+        seconds,
+        mode=inputs.get("optimization_mode", "max_savings"),
+        status=result.get("status", "error"),
+        size=model_size_label(len(inputs.get("variable_categories", ())))
+    )
+
+
+class _RequestDbStats:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Set per request by MetricsMiddleware; SQLAlchemy propagates it into run_sync greenlets
+_request_db: ContextVar[_RequestDbStats | None] = ContextVar("request_db_stats", default=None)
+
+
+def instrument_engine(engine: Engine, role: str) -> None:
+    """Time every query on a (sync, or an async engine's sync_engine) engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        DB_QUERY_SECONDS.observe(elapsed, engine=role)
+        stats = _request_db.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context) -> None:
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+class _TimedPool:
+    """Pool mixin recording how long each checkout waited for a connection."""
+    metrics_role = ""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - started, pool=self.metrics_role)
+
+
+def timed_pool_class(base: type, role: str) -> type:
+    """A subclass of a SQLAlchemy pool class that records checkout waits under role."""
+    return type(f"Timed{base.__name__}", (_TimedPool, base), {"metrics_role": role})
+
+
+class MetricsMiddleware:
+    """Record request latency and per-request database work by route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        stats = _RequestDbStats()
+        token = _request_db.set(stats)
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_db.reset(token)
+            # The router stores the matched route in the scope; unmatched paths share one label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"] if scope["method"] in _HTTP_METHODS else "other"
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started, route=route, method=method, status=f"{status_code // 100}xx"
+            )
+            REQUEST_DB_QUERIES.observe(stats.queries, route=route)
+            REQUEST_DB_SECONDS.observe(stats.seconds, route=route)
@@ -0,0 +1,142 @@
+"""
+Opt-in per-request phase timings for the optimize routes.
+
+A profiled request carries a RequestProfile in a context variable. Hot-path
+code wraps its phases in ``phase(name)``, which returns a shared no-op
+context manager when no profile is active, so unprofiled requests pay one
+ContextVar lookup per phase. Solver work runs in pool workers through
+run_profiled, which profiles it there and sends the timings back with the
+result.
+
+Phases (seconds, summed when a phase repeats):
+    profile_load   loading the user's profile and goal
+    result_lookup  looking for a stored solution of the same problem
+    solver_call    round trip to the solver pool, covering the three below
+    model_build    collapsing the inputs into a BudgetModel
+    solve          running the backend; with PuLP, split into pulp_build and cbc
+    extract        building the response payload from the solution
+    db_write       storing the result
+    encode         rendering the JSON body
+
+Batch scenario solves run on threads inside the worker and only report
+solver_call.
+
+A sampled fraction of profiled requests also writes cProfile dumps, one for
+the API process and one for the solver worker, named after the profile id.
+The API dump covers the event loop thread, so it includes whatever other
+requests ran on it meanwhile.
+"""
+import contextlib
+import cProfile
+import logging
+import os
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+_NO_PHASE = contextlib.nullcontext()
+
+_current: ContextVar["RequestProfile | None"] = ContextVar("request_profile", default=None)
+
+# cProfile cannot run twice at once in a process; a capture that finds it busy is skipped
+_cprofile_lock = threading.Lock()
+
+
+class RequestProfile:
+    """Phase timings of one profiled request, plus the paths of any cProfile dumps."""
+
+    def __init__(self, profile_id: str | None = None, dump_dir: str | None = None):
+        self.id = profile_id or uuid.uuid4().hex[:16]
+        self.dump_dir = dump_dir
+        self.phases: dict[str, float] = {}
+        self.dumps: list[str] = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def cprofile(self, suffix: str) -> Iterator[None]:
+        """Run the block under cProfile and dump it, if this profile samples dumps and cProfile is free."""
+        if self.dump_dir is None or not _cprofile_lock.acquire(blocking=False):
+            yield
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+            os.makedirs(self.dump_dir, exist_ok=True)
+            path = os.path.join(self.dump_dir, f"{self.id}-{suffix}.prof")
+            profiler.dump_stats(path)
+            self.dumps.append(path)
+        finally:
+            _cprofile_lock.release()
+
+    def server_timing(self) -> str:
+        """The phases as a Server-Timing header value, in milliseconds."""
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.phases.items())
+
+
+def current_profile() -> RequestProfile | None:
+    return _current.get()
+
+
+def activate(profile: RequestProfile) -> None:
+    """Make profile current for the rest of this request's context (task, thread or greenlet)."""
+    _current.set(profile)
+
+
+def phase(name: str) -> contextlib.AbstractContextManager:
+    """Time a block into the current request's profile; a no-op when the request is not profiled."""
+    profile = _current.get()
+    if profile is None:
+        return _NO_PHASE
+    return profile.phase(name)
+
+
+def run_profiled(
+    fn: Callable[..., Any],
+    args: tuple,
+    kwargs: dict,
+    profile_id: str,
+    dump_dir: str | None
+) -> tuple[Any, dict[str, float], list[str]]:
+    """
+    Solver pool entry point for a profiled request: fn(*args, **kwargs) with
+    its phases recorded (and dumped, if sampled) in the worker.
+
+    Returns:
+        fn's result, its phase timings and the paths of any dumps written
+    """
+    profile = RequestProfile(profile_id, dump_dir)
+    token = _current.set(profile)
+    try:
+        with profile.cprofile("solver"):
+            result = fn(*args, **kwargs)
+    finally:
+        _current.reset(token)
+    return result, profile.phases, profile.dumps
+
+
+def log_profile(profile: RequestProfile, route: str) -> None:
+    logger.info(
+        "Profile %s for %s: %s%s",
+        profile.id,
+        route,
+        ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in profile.phases.items()),
+        f"; dumps: {', '.join(profile.dumps)}" if profile.dumps else ""
+    )
@@ -0,0 +1,27 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    orjson response that also accepts numpy scalars and Decimals.
+
+    Solver results may carry numpy floats from the HiGHS/SciPy backends, which
+    orjson only serializes with OPT_SERIALIZE_NUMPY.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
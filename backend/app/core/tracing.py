@@ -0,0 +1,181 @@
+"""
+Lightweight span tracing to local JSON lines files.
+
+Each finished span is written as one line in the shape of an OpenTelemetry
+span (trace_id, span_id, parent_span_id, name, kind, start/end time in unix
+nanoseconds, attributes, status), so files can be loaded into OTel tooling
+without running a collector. TracingMiddleware opens the root span of a
+sampled request and continues an incoming W3C traceparent; ``span(name)``
+and ``traced(name)`` open child spans and are no-ops outside a traced request.
+
+Files rotate at TRACING_MAX_BYTES; a "{pid}" in a path is replaced by the
+process id so worker processes never rotate each other's files.
+"""
+import contextlib
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import random
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+_NO_SPAN = contextlib.nullcontext()
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    """An open span; written to the trace file when it ends."""
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "kind", "attributes", "start_ns", "error")
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: str | None,
+        kind: str = "INTERNAL",
+        attributes: dict[str, Any] | None = None
+    ):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.error: str | None = None
+
+    def end(self) -> None:
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": f"SPAN_KIND_{self.kind}",
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": time.time_ns(),
+            "attributes": self.attributes,
+            "status": {"code": "STATUS_CODE_ERROR", "message": self.error}
+            if self.error is not None else {"code": "STATUS_CODE_OK"},
+            "resource": {"service.name": settings.PROJECT_NAME, "process.pid": os.getpid()},
+        }
+        write_jsonl(settings.TRACING_FILE, record)
+
+
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_trace_id() -> str | None:
+    current = _current.get()
+    return current.trace_id if current is not None else None
+
+
+@contextlib.contextmanager
+def _open_span(span: Span) -> Iterator[Span]:
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        _current.reset(token)
+        span.end()
+
+
+def span(name: str, **attributes: Any) -> contextlib.AbstractContextManager:
+    """Child span of the current span; a no-op when the request is not traced."""
+    parent = _current.get()
+    if parent is None:
+        return _NO_SPAN
+    return _open_span(Span(name, parent.trace_id, parent.span_id, attributes=attributes))
+
+
+def traced(name: str) -> Callable:
+    """Decorator running an async function (e.g. a route) in a child span."""
+
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+@functools.lru_cache(maxsize=None)
+def _file_logger(path: str) -> logging.Logger:
+    path = path.replace("{pid}", str(os.getpid()))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=settings.TRACING_MAX_BYTES, backupCount=settings.TRACING_BACKUP_COUNT
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    file_logger = logging.getLogger(f"{__name__}.file.{path}")
+    file_logger.propagate = False
+    file_logger.setLevel(logging.INFO)
+    file_logger.addHandler(handler)
+    return file_logger
+
+
+def write_jsonl(path: str, record: dict) -> None:
+    """Append one JSON record to a rotating file; handlers are thread-safe."""
+    _file_logger(path).info(json.dumps(record, separators=(",", ":"), default=str))
+
+
+class TracingMiddleware:
+    """Open a SERVER root span for each sampled HTTP request."""
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_span_id, sampled = None, None, random.random() < self.sample_rate
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                match = _TRACEPARENT.match(value.decode("latin-1"))
+                if match:
+                    trace_id, parent_span_id = match.group(1), match.group(2)
+                    sampled = int(match.group(3), 16) & 1 == 1
+                break
+        if not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        root = Span(
+            f"{scope['method']} {scope['path']}",
+            trace_id or os.urandom(16).hex(),
+            parent_span_id,
+            kind="SERVER",
+            attributes={"http.method": scope["method"], "http.target": scope["path"]}
+        )
+
+        async def send_with_trace(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-trace-id", root.trace_id.encode())]
+            await send(message)
+
+        with _open_span(root):
+            try:
+                await self.app(scope, receive, send_with_trace)
+            finally:
+                # Name by route template once the router has matched, as OTel HTTP spans do
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    root.name = f"{scope['method']} {route}"
+                    root.attributes["http.route"] = route
@@ -1,17 +1,71 @@
-from fastapi import FastAPI
+import logging
+import time
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from . import IMPORT_STARTED
+from .core.compression import CompressionMiddleware
 from .core.config import settings
-from .core.database import engine, Base
-from .api.routes import auth, budget, optimize
+from .core.responses import FastJSONResponse
+from .core.database import async_engine, check_database
+from .core.metrics import CONTENT_TYPE, Gauge, MetricsMiddleware, registry
+from .core.tracing import TracingMiddleware
+from .api.routes import auth, budget, optimize, jobs
+from .services.admission import solver_admission
+from .services.jobs import job_runner
+from .services.solver_pool import solver_pool
+
+logger = logging.getLogger(__name__)
+
+# Seconds spent importing the app and running lifespan startup, for /ready
+startup_timings = {"import_seconds": time.perf_counter() - IMPORT_STARTED, "lifespan_seconds": None}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start pre-warmed solver workers and the job runner before serving; stop them on shutdown.
+
+    The schema is managed by Alembic, so startup issues no DDL. The database
+    is only probed to warm the connection pool; if it is down the app still
+    starts and /ready reports it.
+    """
+    started = time.perf_counter()
+    try:
+        await check_database()
+    except (SQLAlchemyError, OSError):
+        logger.warning("Database unreachable at startup", exc_info=True)
+    await run_in_threadpool(solver_pool.start)
+    job_runner.start()
+    startup_timings["lifespan_seconds"] = time.perf_counter() - started
+    logger.info(
+        "Startup finished: import %.3fs, lifespan %.3fs",
+        startup_timings["import_seconds"], startup_timings["lifespan_seconds"]
+    )
+    yield
+    job_runner.stop()
+    solver_pool.shutdown()
+    await async_engine.dispose()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
+)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.RESPONSE_COMPRESSION_MIN_SIZE,
+    gzip_level=settings.RESPONSE_GZIP_LEVEL,
+    brotli_quality=settings.RESPONSE_BROTLI_QUALITY
 )
 
 # Configure CORS
@@ -23,10 +77,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware, sample_rate=settings.TRACING_SAMPLE_RATE)
+
+# Outermost, so latency covers every other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(budget.router, prefix=f"{settings.API_V1_STR}/budget", tags=["budget"])
 app.include_router(optimize.router, prefix=f"{settings.API_V1_STR}/optimize", tags=["optimize"])
+app.include_router(jobs.router, prefix=f"{settings.API_V1_STR}/optimize/jobs", tags=["jobs"])
 
 
 @app.get("/")
@@ -43,3 +104,56 @@ def root():
 def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+def _threadpool_usage() -> dict[tuple[str, ...], float]:
+    # The request threadpool is anyio's default limiter; read from the event loop thread
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    return {
+        ("in_use",): limiter.borrowed_tokens,
+        ("size",): limiter.total_tokens,
+        ("waiting",): limiter.statistics().tasks_waiting,
+    }
+
+
+def _solver_usage() -> dict[tuple[str, ...], float]:
+    return {
+        ("pool_pending",): solver_pool.pending,
+        ("pool_size",): solver_pool.size,
+        ("admission_active",): solver_admission.active,
+        ("admission_queued",): solver_admission.queued,
+    }
+
+
+registry.register(Gauge("threadpool_threads", "Request threadpool saturation.", _threadpool_usage, ("state",)))
+registry.register(Gauge("solver_capacity", "Solver pool and admission queue occupancy.", _solver_usage, ("state",)))
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for this process."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe: 503 until lifespan startup has finished or while the
+    database is unreachable.
+    """
+    database = True
+    try:
+        await check_database()
+    except (SQLAlchemyError, OSError):
+        database = False
+
+    ready = database and startup_timings["lifespan_seconds"] is not None
+    return FastJSONResponse(
+        {
+            "status": "ready" if ready else "not_ready",
+            "database": database,
+            "solver_pool": solver_pool.stats(),
+            "startup": startup_timings
+        },
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
@@ -1,8 +1,7 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Date, Text
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Date, Text, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import JSONB
-from ..core.database import Base
+from ..core.database import Base, PortableJSON
 
 
 class BudgetProfile(Base):
@@ -62,13 +61,45 @@ class FinancialGoal(Base):
     profile = relationship("BudgetProfile", back_populates="financial_goals")
 
 
+class OptimizationSolution(Base):
+    """
+    Result payload stored once per distinct content and shared by result rows.
+
+    result_json holds the services.result_codec compact form (or, for rows
+    written before it, the full form); content_hash is of the full form.
+    """
+    __tablename__ = "optimization_solutions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), unique=True, index=True, nullable=False)
+    result_json = Column(PortableJSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    results = relationship("OptimizationResult", back_populates="solution")
+
+
 class OptimizationResult(Base):
     __tablename__ = "optimization_results"
 
     id = Column(Integer, primary_key=True, index=True)
     profile_id = Column(Integer, ForeignKey("budget_profiles.id"), nullable=False)
-    result_json = Column(JSONB, nullable=False)
+    solution_id = Column(Integer, ForeignKey("optimization_solutions.id"), nullable=False)
+    problem_hash = Column(String(64), index=True, nullable=True)  # unknown for backfilled rows
+    result_hash = Column(String(64), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Copied from the payload so history listings need not read it
+    status = Column(String(20), nullable=True)
+    monthly_savings = Column(Numeric(10, 2), nullable=True)
+    months_to_goal = Column(Float, nullable=True)
+    total_monthly_spending = Column(Numeric(10, 2), nullable=True)
+
+    __table_args__ = (
+        # Newest-first history per profile, id breaking created_at ties
+        Index("ix_optimization_results_profile_history", profile_id, created_at.desc(), id.desc()),
+    )
+
     # Relationships
     profile = relationship("BudgetProfile", back_populates="optimization_results")
+    solution = relationship("OptimizationSolution", back_populates="results")
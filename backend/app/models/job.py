@@ -0,0 +1,26 @@
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..core.database import Base, PortableJSON
+
+
+class OptimizationJob(Base):
+    __tablename__ = "optimization_jobs"
+
+    id = Column(String(36), primary_key=True)  # uuid4
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    kind = Column(String(20), nullable=False)  # "optimize", "scenario", "scenario_batch"
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    payload = Column(PortableJSON, nullable=False)
+    result = Column(PortableJSON, nullable=True)
+    error = Column(Text, nullable=True)
+    progress = Column(Float, nullable=False, default=0.0)
+    attempts = Column(Integer, nullable=False, default=0)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    user = relationship("User")
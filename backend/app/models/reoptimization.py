@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class ReoptimizationRun(Base):
+    """Progress checkpoint of a bulk re-optimization over all profiles."""
+    __tablename__ = "reoptimization_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String(20), nullable=False, default="running")  # "running", "completed", "abandoned"
+    optimization_mode = Column(String(20), nullable=False)
+    last_profile_id = Column(Integer, nullable=False, default=0)  # profiles up to this id are done
+    profiles_processed = Column(Integer, nullable=False, default=0)
+    profiles_failed = Column(Integer, nullable=False, default=0)
+    results_inserted = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
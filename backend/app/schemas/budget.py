@@ -78,7 +78,7 @@ class BudgetProfileCreate(BudgetProfileBase):
 
 
 class BudgetProfileUpdate(BaseModel):
-    monthly_income: Decimal | None = None
+    monthly_income: Decimal | None = Field(default=None, gt=0)
     fixed_expenses: list[FixedExpenseCreate] | None = None
     variable_expenses: list[VariableExpenseCreate] | None = None
     financial_goals: list[FinancialGoalCreate] | None = None
@@ -96,11 +96,20 @@ class BudgetProfile(BudgetProfileBase):
     model_config = ConfigDict(from_attributes=True)
 
 
-# Optimization Result Schema
+# Optimization Result Schemas
 class OptimizationResult(BaseModel):
     id: int
     profile_id: int
-    result_json: dict
     created_at: datetime
+    status: str | None = None
+    monthly_savings: Decimal | None = None
+    months_to_goal: float | None = None
+    total_monthly_spending: Decimal | None = None
+    result_json: dict | None = None  # only when requested
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class OptimizationHistory(BaseModel):
+    items: list[OptimizationResult]
+    next_cursor: str | None = None  # pass as ?cursor= for the next page
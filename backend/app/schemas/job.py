@@ -0,0 +1,36 @@
+from pydantic import BaseModel, ConfigDict, model_validator
+from datetime import datetime
+from typing import Literal
+
+from .optimization import OptimizationRequest, ScenarioRequest, BatchScenarioRequest
+
+
+class JobCreate(BaseModel):
+    """Request schema for enqueuing an optimization job. Set the field matching kind."""
+    kind: Literal["optimize", "scenario", "scenario_batch"]
+    optimization: OptimizationRequest | None = None
+    scenario: ScenarioRequest | None = None
+    batch: BatchScenarioRequest | None = None
+
+    @model_validator(mode="after")
+    def check_payload(self) -> "JobCreate":
+        field = {"optimize": "optimization", "scenario": "scenario", "scenario_batch": "batch"}[self.kind]
+        if self.kind == "optimize" and self.optimization is None:
+            self.optimization = OptimizationRequest()
+        if getattr(self, field) is None:
+            raise ValueError(f"'{field}' is required for {self.kind} jobs")
+        return self
+
+
+class Job(BaseModel):
+    id: str
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    progress: float
+    result: dict | None = None
+    error: str | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from decimal import Decimal
 from typing import Literal
 
@@ -10,16 +10,31 @@ class OptimizationRequest(BaseModel):
 
 
 class OptimizationResponse(BaseModel):
-    """Response schema for optimization results."""
+    """
+    Response schema for optimization results.
+
+    Amounts are floats, as the optimizer produces them. Routes return
+    optimization_response_content directly instead of instantiating this model.
+    """
     status: Literal["optimal", "infeasible", "error"]
     message: str | None = None
-    monthly_savings: Decimal | None = None
+    monthly_savings: float | None = None
     spending_allocation: dict[str, float] | None = None
-    total_monthly_spending: Decimal | None = None
+    total_monthly_spending: float | None = None
     months_to_goal: float | None = None
     projected_savings: list[float] | None = None
 
 
+def optimization_response_content(result: dict) -> dict:
+    """
+    Shape an optimizer result as an OptimizationResponse without validating it.
+
+    Optimizer results are already JSON-native, so the fields are picked out
+    as they are for FastJSONResponse to serialize.
+    """
+    return {field: result.get(field) for field in OptimizationResponse.model_fields}
+
+
 class ScenarioRequest(BaseModel):
     """Request schema for what-if scenario analysis."""
     monthly_income: Decimal = Field(..., gt=0)
@@ -28,3 +43,66 @@ class ScenarioRequest(BaseModel):
     savings_goal: Decimal = Field(default=Decimal("0"), ge=0)
     months_to_goal: int = Field(default=12, gt=0)
     optimization_mode: Literal["max_savings", "balanced", "fastest_goal"] = "max_savings"
+
+
+class ScenarioDelta(BaseModel):
+    """
+    Changes applied to a base scenario in a batch request.
+
+    Unset fields keep the base value. Expense dictionaries are merged into the
+    base; mapping a category to null removes it.
+    """
+    monthly_income: Decimal | None = Field(default=None, gt=0)
+    fixed_expenses: dict[str, Decimal | None] = {}
+    variable_categories: dict[str, tuple[Decimal, Decimal] | None] = {}
+    savings_goal: Decimal | None = Field(default=None, ge=0)
+    months_to_goal: int | None = Field(default=None, gt=0)
+    optimization_mode: Literal["max_savings", "balanced", "fastest_goal"] | None = None
+
+
+class BatchScenarioRequest(BaseModel):
+    """Request schema for batch scenario analysis: either explicit scenarios or a base plus deltas."""
+    scenarios: list[ScenarioRequest] | None = None
+    base: ScenarioRequest | None = None
+    deltas: list[ScenarioDelta] | None = None
+    time_budget: float | None = Field(default=None, gt=0)  # seconds, capped by settings
+
+    @model_validator(mode="after")
+    def check_shape(self) -> "BatchScenarioRequest":
+        if (self.scenarios is None) == (self.base is None):
+            raise ValueError("Provide either 'scenarios' or 'base' with 'deltas'")
+        if self.base is not None and self.deltas is None:
+            raise ValueError("'deltas' is required when 'base' is given")
+        return self
+
+
+class BatchScenarioResponse(BaseModel):
+    """Response schema for batch scenario analysis. Results are in input order."""
+    results: list[OptimizationResponse]
+    solved: int
+    failed: int
+    budget_exhausted: bool
+    elapsed_seconds: float
+
+
+class SensitivityRequest(ScenarioRequest):
+    """Request schema for a parametric sweep of monthly income or one fixed expense."""
+    parameter: str = "monthly_income"  # or the name of a fixed expense category
+    points: list[Decimal] = Field(default=[], max_length=10000)  # parameter values to evaluate
+
+
+class SensitivityPoint(BaseModel):
+    """Optimal plan at one value of the swept parameter."""
+    value: float
+    status: Literal["optimal", "infeasible"]
+    monthly_savings: float | None = None
+    spending_allocation: dict[str, float] | None = None
+
+
+class SensitivityResponse(BaseModel):
+    """Response schema for a parametric sweep."""
+    parameter: str
+    feasibility_limit: float | None = None  # income floor, or fixed expense ceiling
+    breakpoints: list[SensitivityPoint]
+    tail_slope: float  # d(savings)/d(parameter) past the breakpoint farthest from the feasibility limit
+    points: list[SensitivityPoint] = []
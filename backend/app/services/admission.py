@@ -0,0 +1,147 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from ..core.config import settings
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of being admitted to the solver."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Global limiter for concurrent solver work with a bounded FIFO wait queue.
+
+    At most max_concurrency requests hold a slot; up to max_queue more wait
+    for one, each for at most max_wait seconds. A request arriving to a full
+    queue is rejected immediately (429) and one that waits too long is
+    rejected with 503; both carry a Retry-After estimate derived from the
+    recent average slot hold time.
+
+    The solver timeout handed to an admitted request shrinks linearly with the
+    queue depth it saw, from base_timeout with an empty queue down to
+    min_timeout with a full one, so a backlog drains faster.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        max_wait: float,
+        base_timeout: int,
+        min_timeout: int
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.base_timeout = base_timeout
+        self.min_timeout = min_timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._avg_hold = 0.1  # seconds, exponentially weighted
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_wait_timeout = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to be free for a new request."""
+        backlog = self.queued + 1
+        return max(1, math.ceil(self._avg_hold * backlog / self.max_concurrency))
+
+    def solver_timeout(self, queue_depth: int) -> int:
+        """Solver time limit for a request admitted behind queue_depth others."""
+        fraction = min(1.0, queue_depth / self.max_queue) if self.max_queue else 0.0
+        return max(self.min_timeout, int(self.base_timeout * (1 - fraction)))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[int]:
+        """
+        Hold a solver slot for the duration of the block.
+
+        Yields:
+            The solver timeout in seconds for this request
+
+        Raises:
+            AdmissionRejected: The queue is full or the wait timed out
+        """
+        depth = self.queued
+        await self._acquire()
+        self.admitted += 1
+        start = time.monotonic()
+        try:
+            yield self.solver_timeout(depth)
+        finally:
+            self._avg_hold = 0.8 * self._avg_hold + 0.2 * (time.monotonic() - start)
+            self._release()
+
+    async def _acquire(self) -> None:
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            return
+
+        if self.queued >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(429, "Optimizer is overloaded, please retry later", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # A releasing request hands its slot over by resolving the future
+            await asyncio.wait_for(waiter, self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected_wait_timeout += 1
+            raise AdmissionRejected(503, "Timed out waiting for an optimizer slot", self.retry_after()) from None
+        except asyncio.CancelledError:
+            # Client went away; pass on a slot that was handed over meanwhile
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_wait_timeout": self.rejected_wait_timeout,
+            "avg_hold_seconds": round(self._avg_hold, 4),
+            "current_solver_timeout": self.solver_timeout(self.queued),
+        }
+
+
+solver_admission = AdmissionController(
+    max_concurrency=settings.SOLVER_MAX_CONCURRENCY,
+    max_queue=settings.SOLVER_MAX_QUEUE,
+    max_wait=settings.SOLVER_MAX_QUEUE_WAIT,
+    base_timeout=settings.SOLVER_TIMEOUT,
+    min_timeout=settings.SOLVER_MIN_TIMEOUT
+)
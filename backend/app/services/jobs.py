@@ -0,0 +1,316 @@
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.job import OptimizationJob
+from ..schemas.optimization import (
+    OptimizationRequest,
+    optimization_response_content,
+    ScenarioRequest,
+    BatchScenarioRequest
+)
+from .optimizer import optimize_budget, optimize_budget_batch, canonical_problem, problem_hash
+from .profiles import load_optimization_inputs, ProfileNotFound, GoalNotFound
+from .result_store import find_solved_result, store_result
+from .scenarios import scenario_inputs, expand_batch, batch_response
+from .slow_solves import record_solve
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Job solves run in runner threads, outside the solver pool and its admission
+# control, so they are bounded separately
+_solver_slots = threading.BoundedSemaphore(max(1, settings.JOB_SOLVER_CONCURRENCY))
+
+
+class JobCancelled(Exception):
+    """Raised from a progress checkpoint when cancellation was requested."""
+
+
+class JobFailed(Exception):
+    """Raised by job execution with a message for the client."""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_job(db: Session, user_id: int, kind: str, payload: dict) -> OptimizationJob:
+    """Insert a queued job and wake the local runner. Commits."""
+    job = OptimizationJob(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        kind=kind,
+        status="queued",
+        payload=payload,
+        progress=0.0,
+        attempts=0,
+        cancel_requested=False
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    job_runner.notify()
+    return job
+
+
+def cancel_job(db: Session, job: OptimizationJob) -> OptimizationJob:
+    """
+    Cancel a job. Queued jobs are cancelled immediately; running ones at
+    their next progress checkpoint (a running single solve finishes but its
+    result is discarded). Terminal jobs are left unchanged. Commits.
+    """
+    if job.status == "queued":
+        job.status = "cancelled"
+        job.finished_at = _utcnow()
+    elif job.status == "running":
+        job.cancel_requested = True
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+@contextmanager
+def _solver_slot(progress: Callable[[float], None], fraction: float) -> Iterator[None]:
+    """Hold a job solver slot; while waiting, progress(fraction) keeps the heartbeat fresh."""
+    while not _solver_slots.acquire(timeout=settings.JOB_STALE_AFTER / 4):
+        progress(fraction)
+    try:
+        yield
+    finally:
+        _solver_slots.release()
+
+
+def execute_job(
+    db: Session,
+    user_id: int,
+    kind: str,
+    payload: dict,
+    progress: Callable[[float], None]
+) -> dict:
+    """
+    Run one job's work and return its JSON result.
+
+    Results have the same shape as the matching synchronous endpoint. progress
+    is called with the completed fraction and raises JobCancelled when the job
+    should stop.
+    """
+    if kind == "optimize":
+        request = OptimizationRequest.model_validate(payload)
+        try:
+            profile_id, inputs = load_optimization_inputs(
+                db, user_id, request.optimization_mode, request.goal_id
+            )
+        except ProfileNotFound:
+            raise JobFailed("Budget profile not found. Please create one first.")
+        except GoalNotFound:
+            raise JobFailed("Financial goal not found")
+
+        problem_digest = problem_hash(canonical_problem(**inputs))
+        result = find_solved_result(db, problem_digest, inputs["fixed_expenses"], inputs["variable_categories"])
+        if result is None:
+            with _solver_slot(progress, 0.0):
+                started = time.perf_counter()
+                result = optimize_budget(**inputs, timeout=settings.SOLVER_TIMEOUT)
+                record_solve(inputs, result, time.perf_counter() - started)
+        progress(1.0)
+
+        if result["status"] == "optimal":
+            store_result(db, profile_id, result, problem_digest)
+            db.info["user_id"] = user_id  # keep the user's reads on the primary (core.database.recent_writers)
+            db.commit()
+        return optimization_response_content(result)
+
+    if kind == "scenario":
+        request = ScenarioRequest.model_validate(payload)
+        inputs = scenario_inputs(request)
+        with _solver_slot(progress, 0.0):
+            started = time.perf_counter()
+            result = optimize_budget(**inputs, timeout=settings.SOLVER_TIMEOUT)
+            record_solve(inputs, result, time.perf_counter() - started)
+        progress(1.0)
+        return optimization_response_content(result)
+
+    if kind == "scenario_batch":
+        request = BatchScenarioRequest.model_validate(payload)
+        start = time.perf_counter()
+        scenarios = expand_batch(request)
+        if len(scenarios) > settings.JOB_BATCH_MAX_SIZE:
+            raise JobFailed(f"Batch too large: at most {settings.JOB_BATCH_MAX_SIZE} scenarios per job")
+
+        time_budget = settings.JOB_BATCH_TIME_BUDGET
+        if request.time_budget is not None:
+            time_budget = min(time_budget, request.time_budget)
+        deadline = time.monotonic() + time_budget
+
+        problems = [scenario_inputs(scenario) for scenario in scenarios if isinstance(scenario, ScenarioRequest)]
+        solved = []
+        # Solve in chunks so progress is reported and cancellation is honoured
+        for offset in range(0, len(problems), settings.JOB_PROGRESS_CHUNK_SIZE):
+            with _solver_slot(progress, len(solved) / len(problems)):
+                solved.extend(optimize_budget_batch(
+                    problems[offset:offset + settings.JOB_PROGRESS_CHUNK_SIZE],
+                    time_budget=deadline - time.monotonic(),
+                    timeout=settings.SOLVER_TIMEOUT,
+                    max_workers=settings.SCENARIO_BATCH_WORKERS,
+                    chunk_size=settings.SCENARIO_BATCH_CHUNK_SIZE
+                ))
+            progress(len(solved) / len(problems))
+
+        return batch_response(scenarios, solved, time.perf_counter() - start)
+
+    raise JobFailed(f"Unknown job kind '{kind}'")
+
+
+class JobRunner:
+    """
+    Local worker pool that executes jobs from the optimization_jobs table.
+
+    Each worker thread claims the oldest queued job with a conditional UPDATE,
+    so several processes can share one table without running a job twice.
+    Running jobs refresh heartbeat_at; a job whose heartbeat is older than
+    stale_after (its worker died or restarted) is put back in the queue, or
+    failed once it has been attempted max_attempts times.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        poll_interval: float,
+        stale_after: float,
+        max_attempts: int,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.session_factory = session_factory
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for idx in range(self.workers):
+            thread = threading.Thread(target=self._loop, name=f"job-worker-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake idle workers after a job was enqueued."""
+        self._wakeup.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job_id = self._claim_next()
+                if job_id is not None:
+                    self._run(job_id)
+                    continue
+            except Exception:
+                logger.exception("Job worker iteration failed")
+
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _claim_next(self) -> str | None:
+        with self.session_factory() as db:
+            self._requeue_stale(db)
+
+            candidates = db.query(OptimizationJob.id).filter(
+                OptimizationJob.status == "queued"
+            ).order_by(OptimizationJob.created_at, OptimizationJob.id).limit(self.workers + 1).all()
+
+            for (job_id,) in candidates:
+                now = _utcnow()
+                claimed = db.query(OptimizationJob).filter(
+                    OptimizationJob.id == job_id,
+                    OptimizationJob.status == "queued"
+                ).update({
+                    OptimizationJob.status: "running",
+                    OptimizationJob.started_at: now,
+                    OptimizationJob.heartbeat_at: now,
+                    OptimizationJob.attempts: OptimizationJob.attempts + 1
+                }, synchronize_session=False)
+                db.commit()
+                if claimed:
+                    return job_id
+
+        return None
+
+    def _requeue_stale(self, db: Session) -> None:
+        cutoff = _utcnow() - timedelta(seconds=self.stale_after)
+        stale = db.query(OptimizationJob).filter(
+            OptimizationJob.status == "running",
+            OptimizationJob.heartbeat_at < cutoff
+        )
+        stale.filter(OptimizationJob.attempts >= self.max_attempts).update({
+            OptimizationJob.status: "failed",
+            OptimizationJob.error: "Job was abandoned by its worker too many times",
+            OptimizationJob.finished_at: _utcnow()
+        }, synchronize_session=False)
+        stale.filter(OptimizationJob.attempts < self.max_attempts).update({
+            OptimizationJob.status: "queued"
+        }, synchronize_session=False)
+        db.commit()
+
+    def _run(self, job_id: str) -> None:
+        with self.session_factory() as db:
+            job = db.get(OptimizationJob, job_id)
+            user_id, kind, payload = job.user_id, job.kind, job.payload
+            job_filter = db.query(OptimizationJob).filter(OptimizationJob.id == job_id)
+
+            def progress(fraction: float) -> None:
+                job_filter.update({
+                    OptimizationJob.progress: fraction,
+                    OptimizationJob.heartbeat_at: _utcnow()
+                }, synchronize_session=False)
+                db.commit()
+                if db.query(OptimizationJob.cancel_requested).filter(OptimizationJob.id == job_id).scalar():
+                    raise JobCancelled()
+
+            values = {}
+            try:
+                result = execute_job(db, user_id, kind, payload, progress)
+                values.update({OptimizationJob.status: "succeeded", OptimizationJob.result: result})
+            except JobCancelled:
+                db.rollback()
+                values[OptimizationJob.status] = "cancelled"
+            except JobFailed as exc:
+                db.rollback()
+                values.update({OptimizationJob.status: "failed", OptimizationJob.error: str(exc)})
+            except Exception as exc:
+                logger.exception("Job %s failed", job_id)
+                db.rollback()
+                values.update({OptimizationJob.status: "failed", OptimizationJob.error: f"Job failed: {exc}"})
+
+            values[OptimizationJob.finished_at] = _utcnow()
+            job_filter.filter(OptimizationJob.status == "running").update(values, synchronize_session=False)
+            db.commit()
+
+
+job_runner = JobRunner(
+    workers=settings.JOB_WORKERS,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    stale_after=settings.JOB_STALE_AFTER,
+    max_attempts=settings.JOB_MAX_ATTEMPTS
+)
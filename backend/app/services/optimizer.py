@@ -1,7 +1,19 @@
-from pulp import LpProblem, LpMaximize, LpVariable, lpSum, LpStatus, PULP_CBC_CMD
+import hashlib
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from typing import Literal
 
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.profiling import phase
+from .solvers import BudgetModel, SOLVER_BACKENDS, get_solver_backend
+
+# Memoized optimize_budget results, keyed by engine and canonical problem
+result_cache = TTLCache(settings.OPTIMIZER_CACHE_SIZE, settings.OPTIMIZER_CACHE_TTL)
+
 
 def optimize_budget(
     monthly_income: float,
@@ -10,7 +22,8 @@ def optimize_budget(
     savings_goal: float = 0,
     months_to_goal: int = 12,
     optimization_mode: Literal["max_savings", "balanced", "fastest_goal"] = "max_savings",
-    timeout: int = 10
+    timeout: int = 10,
+    engine: Literal["closed_form", "pulp", "highs"] | None = None
 ) -> dict:
     """
     Solve the budget optimization problem using Linear Programming.
@@ -36,92 +49,254 @@ def optimize_budget(
         months_to_goal: Number of months to reach savings goal
         optimization_mode: Optimization objective ("max_savings", "balanced", "fastest_goal")
         timeout: Solver timeout in seconds
+        engine: Solver backend name (see app.services.solvers). Defaults to
+            settings.SOLVER_ENGINE; models the backend cannot handle fall back
+            to PuLP/CBC.
 
     Returns:
         Dictionary with optimization results or infeasibility message
     """
+    problem = canonical_problem(
+        monthly_income,
+        fixed_expenses,
+        variable_categories,
+        savings_goal,
+        months_to_goal,
+        optimization_mode
+    )
+    engine = engine or settings.SOLVER_ENGINE
+
+    # Results are always computed from the canonical problem, so a cached
+    # result is exactly what a fresh solve would return. Only proven
+    # outcomes are cached: an "error" (e.g. a solver timeout under load)
+    # says nothing about the problem and must not outlive the request
+    key = (engine, problem_key(problem))
+    result = result_cache.get(key)
+    if result is None:
+        result = _solve(problem, timeout, engine)
+        if result["status"] in ("optimal", "infeasible"):
+            result_cache.set(key, result)
+
+    return reorder_result(result, fixed_expenses, variable_categories)
+
+
+def canonical_problem(
+    monthly_income: float,
+    fixed_expenses: dict[str, float],
+    variable_categories: dict[str, tuple[float, float]],
+    savings_goal: float = 0,
+    months_to_goal: int = 12,
+    optimization_mode: Literal["max_savings", "balanced", "fastest_goal"] = "max_savings"
+) -> dict:
+    """Normalize optimize_budget inputs: floats everywhere, categories sorted by name."""
+    return {
+        "monthly_income": float(monthly_income),
+        "fixed_expenses": {cat: float(fixed_expenses[cat]) for cat in sorted(fixed_expenses)},
+        "variable_categories": {
+            cat: (float(variable_categories[cat][0]), float(variable_categories[cat][1]))
+            for cat in sorted(variable_categories)
+        },
+        "savings_goal": float(savings_goal),
+        "months_to_goal": int(months_to_goal),
+        "optimization_mode": optimization_mode
+    }
+
+
+def problem_key(problem: dict) -> tuple:
+    """Hashable key of a canonical problem."""
+    return (
+        problem["monthly_income"],
+        tuple(problem["fixed_expenses"].items()),
+        tuple(problem["variable_categories"].items()),
+        problem["savings_goal"],
+        problem["months_to_goal"],
+        problem["optimization_mode"]
+    )
+
+
+def content_hash(data: dict) -> str:
+    """SHA-256 of a JSON-serializable dict, independent of key order."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def problem_hash(problem: dict, engine: str | None = None) -> str:
+    """Content address of a canonical problem as solved by the given engine."""
+    return content_hash({"engine": engine or settings.SOLVER_ENGINE, "problem": problem})
+
+
+SOLVER_NOT_SOLVED = "The solver stopped before finding a solution, please retry"
 
-    # Create the LP problem
-    prob = LpProblem("Budget_Optimization", LpMaximize)
 
-    # Decision variables for variable spending categories
-    spending = {}
-    for cat, (min_amt, max_amt) in variable_categories.items():
-        spending[cat] = LpVariable(
-            f"spend_{cat}",
-            lowBound=min_amt,
-            upBound=max_amt
+def _solve(problem: dict, timeout: int, engine: str) -> dict:
+    """Solve a canonical problem with the given backend and build the payload."""
+    with phase("model_build"):
+        model = build_budget_model(**problem)
+
+    with phase("solve"):
+        solution = get_solver_backend(engine).solve(model, timeout)
+        if solution is None:
+            solution = SOLVER_BACKENDS["pulp"].solve(model, timeout)
+
+    with phase("extract"):
+        if solution.status == "not_solved":
+            return {"status": "error", "message": SOLVER_NOT_SOLVED}
+        if solution.status != "optimal":
+            return _infeasible_result(
+                problem["monthly_income"],
+                problem["fixed_expenses"],
+                problem["variable_categories"],
+                problem["savings_goal"],
+                problem["months_to_goal"]
+            )
+
+        # Extract solution
+        return _optimal_result(
+            solution.monthly_savings,
+            solution.spending_allocation,
+            problem["fixed_expenses"],
+            problem["savings_goal"],
+            problem["months_to_goal"]
         )
 
-    # Decision variable for monthly savings
-    savings = LpVariable("savings", lowBound=0)
-
-    # Objective function based on mode
-    if optimization_mode == "max_savings":
-        # Maximize savings
-        prob += savings, "Maximize_Savings"
-
-    elif optimization_mode == "balanced":
-        # Maximize savings while maintaining lifestyle quality
-        # Penalize being too far from maximum spending in each category
-        lifestyle_quality = lpSum([
-            spending[cat] / max_amt
-            for cat, (min_amt, max_amt) in variable_categories.items()
-        ])
-        # Weighted objective: 70% savings, 30% lifestyle
-        prob += savings + 0.3 * lifestyle_quality, "Balanced_Objective"
-
-    elif optimization_mode == "fastest_goal":
-        # Minimize spending to maximize savings (same as max_savings but with tighter constraints)
-        prob += savings, "Fastest_Goal"
-
-    # Constraint 1: Budget balance
-    # Total spending + savings = income
-    total_fixed = sum(fixed_expenses.values())
-    total_variable_spending = lpSum(list(spending.values()))
-    prob += total_variable_spending + savings + total_fixed == monthly_income, "Budget_Balance"
 
-    # Constraint 2: Goal achievement
+def reorder_result(
+    result: dict,
+    fixed_expenses: dict[str, float],
+    variable_categories: dict[str, tuple[float, float]]
+) -> dict:
+    """Copy a (possibly cached) result with its dictionaries in the caller's key order."""
+    if result["status"] != "optimal":
+        return dict(result)
+
+    return {
+        **result,
+        "spending_allocation": {cat: result["spending_allocation"][cat] for cat in variable_categories},
+        "projected_savings": list(result["projected_savings"]),
+        "fixed_expenses": {cat: result["fixed_expenses"][cat] for cat in fixed_expenses},
+        "income_allocation": dict(result["income_allocation"])
+    }
+
+
+BATCH_BUDGET_EXCEEDED = "Batch time budget exhausted before this scenario was solved"
+
+
+def optimize_budget_batch(
+    problems: list[dict],
+    time_budget: float,
+    timeout: int = 10,
+    max_workers: int = 4,
+    chunk_size: int = 64
+) -> list[dict]:
+    """
+    Solve many independent optimize_budget problems under one time budget.
+
+    Problems are split into chunks that are fanned out over a thread pool
+    (CBC runs as a subprocess and HiGHS releases the GIL, so threads overlap
+    solver work; closed-form solves are cheap enough that chunking keeps the
+    per-task overhead negligible). Each solver timeout is capped by what is
+    left of the budget, and scenarios reached after it runs out are reported
+    with status "error" instead of being solved.
+
+    Args:
+        problems: Keyword arguments for optimize_budget, one dict per scenario
+        time_budget: Wall-clock seconds available for the whole batch
+        timeout: Per-scenario solver timeout in seconds
+        max_workers: Number of worker threads
+        chunk_size: Scenarios solved per worker task
+
+    Returns:
+        One result dictionary per problem, in input order. A scenario that
+        raised is reported with status "error" and does not affect the others.
+    """
+    deadline = time.monotonic() + time_budget
+    results: list[dict | None] = [None] * len(problems)
+
+    def solve_chunk(start: int) -> None:
+        for idx in range(start, min(start + chunk_size, len(problems))):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                results[idx] = {"status": "error", "message": BATCH_BUDGET_EXCEEDED}
+                continue
+            try:
+                results[idx] = optimize_budget(
+                    **problems[idx],
+                    timeout=max(1, min(timeout, math.ceil(remaining)))
+                )
+            except Exception as exc:
+                results[idx] = {"status": "error", "message": f"Optimization failed: {exc}"}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(solve_chunk, range(0, len(problems), chunk_size)))
+
+    return results
+
+
+def build_budget_model(
+    monthly_income: float,
+    fixed_expenses: dict[str, float],
+    variable_categories: dict[str, tuple[float, float]],
+    savings_goal: float = 0,
+    months_to_goal: int = 12,
+    optimization_mode: Literal["max_savings", "balanced", "fastest_goal"] = "max_savings"
+) -> BudgetModel:
+    """Collapse optimize_budget inputs into the solver-agnostic model."""
     # Monthly savings must be enough to reach goal in specified months
+    min_monthly_savings = 0.0
     if savings_goal > 0 and months_to_goal > 0:
         min_monthly_savings = savings_goal / months_to_goal
-        prob += savings >= min_monthly_savings, "Goal_Constraint"
-
-    # Solve the problem
-    solver = PULP_CBC_CMD(msg=0, timeLimit=timeout)
-    prob.solve(solver)
-
-    # Check solution status
-    status = LpStatus[prob.status]
-
-    if status != "Optimal":
-        # Calculate why it's infeasible
-        total_fixed_float = float(total_fixed)
-        min_variable = sum(min_amt for min_amt, max_amt in variable_categories.values())
-        min_required = total_fixed_float + min_variable
-
-        if savings_goal > 0 and months_to_goal > 0:
-            min_savings_required = savings_goal / months_to_goal
-            min_required += min_savings_required
-
-        message = f"Cannot meet goals with current income/constraints. "
-        message += f"Minimum required income: ${min_required:.2f}, "
-        message += f"Current income: ${monthly_income:.2f}. "
-
-        if min_required > monthly_income:
-            shortfall = min_required - monthly_income
-            message += f"Monthly shortfall: ${shortfall:.2f}. "
-            message += "Consider: (1) Increasing income, (2) Reducing fixed expenses, "
-            message += "(3) Lowering minimum spending requirements, or (4) Adjusting savings goals."
-
-        return {
-            "status": "infeasible",
-            "message": message
-        }
 
-    # Extract solution
-    monthly_savings_value = savings.varValue
-    spending_allocation = {cat: var.varValue for cat, var in spending.items()}
+    return BudgetModel(
+        monthly_income=monthly_income,
+        total_fixed=sum(fixed_expenses.values()),
+        variable_categories=variable_categories,
+        min_monthly_savings=min_monthly_savings,
+        optimization_mode=optimization_mode
+    )
+
+
+def _infeasible_result(
+    monthly_income: float,
+    fixed_expenses: dict[str, float],
+    variable_categories: dict[str, tuple[float, float]],
+    savings_goal: float,
+    months_to_goal: int
+) -> dict:
+    """Explain why the budget cannot be balanced."""
+    # Calculate why it's infeasible
+    total_fixed_float = float(sum(fixed_expenses.values()))
+    min_variable = sum(min_amt for min_amt, max_amt in variable_categories.values())
+    min_required = total_fixed_float + min_variable
+
+    if savings_goal > 0 and months_to_goal > 0:
+        min_savings_required = savings_goal / months_to_goal
+        min_required += min_savings_required
+
+    message = f"Cannot meet goals with current income/constraints. "
+    message += f"Minimum required income: ${min_required:.2f}, "
+    message += f"Current income: ${monthly_income:.2f}. "
+
+    if min_required > monthly_income:
+        shortfall = min_required - monthly_income
+        message += f"Monthly shortfall: ${shortfall:.2f}. "
+        message += "Consider: (1) Increasing income, (2) Reducing fixed expenses, "
+        message += "(3) Lowering minimum spending requirements, or (4) Adjusting savings goals."
+
+    return {
+        "status": "infeasible",
+        "message": message
+    }
+
+
+def _optimal_result(
+    monthly_savings_value: float,
+    spending_allocation: dict[str, float],
+    fixed_expenses: dict[str, float],
+    savings_goal: float,
+    months_to_goal: int
+) -> dict:
+    """Build the response payload from an optimal allocation."""
+    total_fixed = sum(fixed_expenses.values())
     total_monthly_spending = sum(spending_allocation.values()) + total_fixed
 
     # Calculate projected savings over time
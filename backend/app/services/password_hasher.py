@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from ..core.config import settings
+from ..core.security import get_password_hash, verify_and_update_password
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full."""
+
+
+class PasswordHasherTimeout(Exception):
+    """Raised when a hash does not finish within its timeout."""
+
+
+class _Timing:
+    """Count, mean and max of a duration, in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def stats(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(1000 * self.total / self.count, 2) if self.count else 0.0,
+            "max_ms": round(1000 * self.max, 2),
+        }
+
+
+class PasswordHasher:
+    """
+    Dedicated thread pool for bcrypt so login bursts cannot occupy the
+    request threadpool that every other sync endpoint depends on.
+
+    bcrypt releases the GIL, so hashes run in parallel up to size threads.
+    Up to queue_depth more wait; beyond that calls raise PasswordHasherBusy,
+    and a hash not finished within timeout seconds (queue wait included)
+    raises PasswordHasherTimeout. Hash latency and queue wait are recorded
+    so BCRYPT_ROUNDS can be tuned against measured throughput.
+    """
+
+    def __init__(self, size: int, queue_depth: int, timeout: float):
+        self.size = size
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self.pending = 0
+        self.rejected_busy = 0
+        self.timeouts = 0
+        self.rehashed = 0
+        self.hash_latency = _Timing()
+        self.queue_wait = _Timing()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="password-hash")
+
+    async def hash(self, password: str) -> str:
+        """Hash a new password."""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """
+        Verify a password.
+
+        Returns:
+            (whether it matches, replacement hash if the stored one should be
+            upgraded to the current BCRYPT_ROUNDS, else None)
+        """
+        valid, new_hash = await self._run(verify_and_update_password, password, hashed_password)
+        if new_hash is not None:
+            self.rehashed += 1
+        return valid, new_hash
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self.pending >= self.size + self.queue_depth:
+                self.rejected_busy += 1
+                raise PasswordHasherBusy()
+            self.pending += 1
+
+        # pending counts work until the thread finishes it, even if the
+        # caller stopped waiting, so the bound reflects real pool occupancy
+        future = self._executor.submit(self._timed, fn, time.perf_counter(), *args)
+        future.add_done_callback(self._done)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise PasswordHasherTimeout() from None
+
+    def _timed(self, fn: Callable[..., Any], submitted: float, *args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.queue_wait.observe(start - submitted)
+                self.hash_latency.observe(end - start)
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "queue_depth": self.queue_depth,
+                "pending": self.pending,
+                "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+                "hash_latency": self.hash_latency.stats(),
+                "queue_wait": self.queue_wait.stats(),
+                "rejected_busy": self.rejected_busy,
+                "timeouts": self.timeouts,
+                "rehashed": self.rehashed,
+            }
+
+
+password_hasher = PasswordHasher(
+    size=settings.PASSWORD_HASH_WORKERS,
+    queue_depth=settings.PASSWORD_HASH_QUEUE_DEPTH,
+    timeout=settings.PASSWORD_HASH_TIMEOUT
+)
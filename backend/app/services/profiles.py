@@ -0,0 +1,384 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import (
+    Date,
+    Integer,
+    Numeric,
+    String,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    union_all,
+    update
+)
+from sqlalchemy.orm import Session
+
+from ..models.budget import BudgetProfile, FixedExpense, VariableExpense, FinancialGoal
+from ..schemas.budget import BudgetProfileCreate, BudgetProfileUpdate
+
+
+class ProfileNotFound(LookupError):
+    """The user has no budget profile."""
+
+
+class GoalNotFound(LookupError):
+    """The requested financial goal does not belong to the user's profile."""
+
+
+@dataclass(frozen=True)
+class FixedExpenseSnapshot:
+    id: int
+    profile_id: int
+    category: str
+    amount: Decimal
+
+
+@dataclass(frozen=True)
+class VariableExpenseSnapshot:
+    id: int
+    profile_id: int
+    category: str
+    min_amount: Decimal
+    max_amount: Decimal
+
+
+@dataclass(frozen=True)
+class FinancialGoalSnapshot:
+    id: int
+    profile_id: int
+    name: str
+    target_amount: Decimal
+    current_amount: Decimal | None
+    deadline: date | None
+    priority: int | None
+
+
+@dataclass(frozen=True)
+class ProfileSnapshot:
+    """
+    Read-only copy of a budget profile with its expenses and goals.
+
+    Detached from the session, so reading it never triggers a lazy load. It
+    has the attributes of the BudgetProfile response schema.
+    """
+    id: int
+    user_id: int
+    monthly_income: Decimal
+    created_at: datetime
+    updated_at: datetime
+    fixed_expenses: tuple[FixedExpenseSnapshot, ...]
+    variable_expenses: tuple[VariableExpenseSnapshot, ...]
+    financial_goals: tuple[FinancialGoalSnapshot, ...]
+
+    @classmethod
+    def from_model(cls, profile: BudgetProfile) -> "ProfileSnapshot":
+        """Snapshot an already loaded profile (collections should be eager-loaded)."""
+        return cls(
+            id=profile.id,
+            user_id=profile.user_id,
+            monthly_income=profile.monthly_income,
+            created_at=profile.created_at,
+            updated_at=profile.updated_at,
+            fixed_expenses=tuple(
+                FixedExpenseSnapshot(e.id, e.profile_id, e.category, e.amount)
+                for e in profile.fixed_expenses
+            ),
+            variable_expenses=tuple(
+                VariableExpenseSnapshot(e.id, e.profile_id, e.category, e.min_amount, e.max_amount)
+                for e in profile.variable_expenses
+            ),
+            financial_goals=tuple(
+                FinancialGoalSnapshot(
+                    g.id, g.profile_id, g.name, g.target_amount, g.current_amount, g.deadline, g.priority
+                )
+                for g in profile.financial_goals
+            )
+        )
+
+
+def load_profile_snapshot(db: Session, user_id: int) -> ProfileSnapshot | None:
+    """
+    Load the user's budget profile with all expenses and goals in one query.
+
+    The three child tables are read through one UNION ALL, outer-joined to
+    the profile row, so the result has one row per child instead of the
+    cartesian product joined eager loading of three collections would give.
+
+    Returns:
+        The profile snapshot, or None if the user has no profile
+    """
+    profile_ids = select(BudgetProfile.id).where(BudgetProfile.user_id == user_id)
+    amount = Numeric(10, 2)
+    items = union_all(
+        select(
+            literal("fixed", String).label("kind"),
+            FixedExpense.id,
+            FixedExpense.profile_id,
+            FixedExpense.category.label("label"),
+            FixedExpense.amount.label("amount"),
+            cast(null(), amount).label("amount_2"),
+            cast(null(), Date).label("deadline"),
+            cast(null(), Integer).label("priority")
+        ).where(FixedExpense.profile_id.in_(profile_ids)),
+        select(
+            literal("variable", String),
+            VariableExpense.id,
+            VariableExpense.profile_id,
+            VariableExpense.category,
+            VariableExpense.min_amount,
+            VariableExpense.max_amount,
+            cast(null(), Date),
+            cast(null(), Integer)
+        ).where(VariableExpense.profile_id.in_(profile_ids)),
+        select(
+            literal("goal", String),
+            FinancialGoal.id,
+            FinancialGoal.profile_id,
+            FinancialGoal.name,
+            FinancialGoal.target_amount,
+            FinancialGoal.current_amount,
+            FinancialGoal.deadline,
+            FinancialGoal.priority
+        ).where(FinancialGoal.profile_id.in_(profile_ids))
+    ).subquery()
+
+    rows = db.execute(
+        select(
+            BudgetProfile.id,
+            BudgetProfile.user_id,
+            BudgetProfile.monthly_income,
+            BudgetProfile.created_at,
+            BudgetProfile.updated_at,
+            items.c.kind,
+            items.c.id.label("item_id"),
+            items.c.label,
+            items.c.amount,
+            items.c.amount_2,
+            items.c.deadline,
+            items.c.priority
+        )
+        .outerjoin(items, items.c.profile_id == BudgetProfile.id)
+        .where(BudgetProfile.user_id == user_id)
+        .order_by(BudgetProfile.id, items.c.kind, items.c.id)
+    ).all()
+
+    if not rows:
+        return None
+
+    profile_id = rows[0].id
+    fixed, variable, goals = [], [], []
+    for row in rows:
+        if row.id != profile_id:
+            break
+        if row.kind == "fixed":
+            fixed.append(FixedExpenseSnapshot(row.item_id, profile_id, row.label, row.amount))
+        elif row.kind == "variable":
+            variable.append(VariableExpenseSnapshot(row.item_id, profile_id, row.label, row.amount, row.amount_2))
+        elif row.kind == "goal":
+            goals.append(FinancialGoalSnapshot(
+                row.item_id, profile_id, row.label, row.amount, row.amount_2, row.deadline, row.priority
+            ))
+
+    first = rows[0]
+    return ProfileSnapshot(
+        id=profile_id,
+        user_id=first.user_id,
+        monthly_income=first.monthly_income,
+        created_at=first.created_at,
+        updated_at=first.updated_at,
+        fixed_expenses=tuple(fixed),
+        variable_expenses=tuple(variable),
+        financial_goals=tuple(goals)
+    )
+
+
+def load_optimization_inputs(
+    db: Session,
+    user_id: int,
+    optimization_mode: str,
+    goal_id: int | None = None
+) -> tuple[int, dict]:
+    """
+    Build optimize_budget keyword arguments from the user's stored profile.
+
+    Returns:
+        (profile id, optimize_budget keyword arguments)
+
+    Raises:
+        ProfileNotFound: The user has no budget profile
+        GoalNotFound: goal_id is not one of the profile's goals
+    """
+    profile = load_profile_snapshot(db, user_id)
+    if profile is None:
+        raise ProfileNotFound()
+
+    return profile.id, optimization_inputs(profile, optimization_mode, goal_id)
+
+
+def optimization_inputs(
+    profile: ProfileSnapshot,
+    optimization_mode: str,
+    goal_id: int | None = None
+) -> dict:
+    """
+    Build optimize_budget keyword arguments from a profile snapshot.
+
+    The savings goal is the requested goal, or the highest-priority one when
+    goal_id is None; its deadline sets the horizon (12 months without one).
+
+    Raises:
+        GoalNotFound: goal_id is not one of the profile's goals
+    """
+    # Prepare data for optimization
+    monthly_income = float(profile.monthly_income)
+
+    fixed_expenses = {
+        expense.category: float(expense.amount)
+        for expense in profile.fixed_expenses
+    }
+
+    variable_categories = {
+        expense.category: (float(expense.min_amount), float(expense.max_amount))
+        for expense in profile.variable_expenses
+    }
+
+    # Determine savings goal
+    savings_goal = 0
+    months_to_goal = 12
+
+    if goal_id:
+        # Optimize for specific goal
+        goal = next(
+            (g for g in profile.financial_goals if g.id == goal_id),
+            None
+        )
+        if not goal:
+            raise GoalNotFound()
+    elif profile.financial_goals:
+        # Use highest priority goal if no specific goal requested
+        goal = max(profile.financial_goals, key=lambda g: g.priority)
+    else:
+        goal = None
+
+    if goal is not None:
+        savings_goal = float(goal.target_amount - goal.current_amount)
+
+        if goal.deadline:
+            months_diff = (goal.deadline.year - datetime.now().year) * 12 + \
+                         (goal.deadline.month - datetime.now().month)
+            months_to_goal = max(1, months_diff)
+
+    return {
+        "monthly_income": monthly_income,
+        "fixed_expenses": fixed_expenses,
+        "variable_categories": variable_categories,
+        "savings_goal": savings_goal,
+        "months_to_goal": months_to_goal,
+        "optimization_mode": optimization_mode
+    }
+
+
+# (profile attribute, model, matching key, compared fields) per child collection
+_CHILD_COLLECTIONS = (
+    ("fixed_expenses", FixedExpense, "category", ("category", "amount")),
+    ("variable_expenses", VariableExpense, "category", ("category", "min_amount", "max_amount")),
+    (
+        "financial_goals", FinancialGoal, "name",
+        ("name", "target_amount", "current_amount", "deadline", "priority")
+    ),
+)
+
+
+def apply_profile_update(
+    db: Session,
+    profile: ProfileSnapshot | None,
+    profile_id: int,
+    changes: BudgetProfileUpdate | BudgetProfileCreate
+) -> bool:
+    """
+    Bring a stored profile in line with changes using the fewest writes.
+
+    Fields left as None are unchanged; a given list replaces that collection.
+    Incoming children are matched to stored ones by category (goals by name,
+    duplicates in order): matches that differ are updated, unmatched incoming
+    items inserted and unmatched stored ones deleted, with at most one bulk
+    DELETE, UPDATE and INSERT per table. The caller commits.
+
+    Args:
+        db: Database session
+        profile: Current state, or None for a just-inserted profile (only
+            its children are written)
+        profile_id: Id of the profile to update
+        changes: Requested state
+
+    Returns:
+        Whether anything was written
+    """
+    profile_values = {}
+    if profile is not None and changes.monthly_income is not None \
+            and changes.monthly_income != profile.monthly_income:
+        profile_values["monthly_income"] = changes.monthly_income
+
+    changed = False
+    for attr, model, key, fields in _CHILD_COLLECTIONS:
+        incoming = getattr(changes, attr)
+        if incoming is None:
+            continue
+        stored = getattr(profile, attr) if profile is not None else ()
+        changed |= _sync_children(db, model, profile_id, stored, incoming, key, fields)
+
+    if profile is None:
+        return changed
+
+    if profile_values or changed:
+        db.execute(
+            update(BudgetProfile)
+            .where(BudgetProfile.id == profile_id)
+            .values(updated_at=func.now(), **profile_values)
+        )
+        return True
+    return False
+
+
+def _sync_children(
+    db: Session,
+    model,
+    profile_id: int,
+    stored: Sequence,
+    incoming: Sequence[BaseModel],
+    key: str,
+    fields: tuple[str, ...]
+) -> bool:
+    unmatched = defaultdict(deque)
+    for item in stored:
+        unmatched[getattr(item, key)].append(item)
+
+    inserts, updates = [], []
+    for item in incoming:
+        values = {field: getattr(item, field) for field in fields}
+        candidates = unmatched.get(values[key])
+        if candidates:
+            current = candidates.popleft()
+            if any(getattr(current, field) != value for field, value in values.items()):
+                updates.append({"id": current.id, **values})
+        else:
+            inserts.append({"profile_id": profile_id, **values})
+    deletes = [item.id for items in unmatched.values() for item in items]
+
+    if deletes:
+        db.execute(delete(model).where(model.id.in_(deletes)))
+    if updates:
+        db.execute(update(model), updates)  # bulk UPDATE by primary key
+    if inserts:
+        db.execute(insert(model), inserts)
+
+    return bool(deletes or updates or inserts)
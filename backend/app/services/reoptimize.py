@@ -0,0 +1,277 @@
+"""
+Bulk re-optimization of every stored budget profile.
+
+Meant to run nightly, after goal deadlines have moved closer, so each user's
+latest stored plan reflects the current horizon. Profiles are streamed in
+chunks with their expenses and goals eager-loaded, solved in worker
+processes and written back with bulk INSERTs, one transaction per chunk.
+Each transaction also advances the run's checkpoint, so a crashed run
+resumes after the last committed profile.
+
+Usage (from the backend directory):
+    python -m app.services.reoptimize --mode max_savings --workers 4
+"""
+import argparse
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Iterator
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, selectinload
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import budget, job, reoptimization, user  # noqa: F401  (register models on Base.metadata)
+from ..models.budget import BudgetProfile, OptimizationResult, OptimizationSolution
+from ..models.reoptimization import ReoptimizationRun
+from .optimizer import optimize_budget, canonical_problem, content_hash, problem_hash
+from .profiles import ProfileSnapshot, optimization_inputs
+from .result_codec import compact_result
+from .result_store import result_summary
+
+logger = logging.getLogger(__name__)
+
+# (profile id, problem hash, result or None if solving raised)
+SolvedProfile = tuple[int, str | None, dict | None]
+
+
+def solve_profiles(problems: list[tuple[int, dict]]) -> list[SolvedProfile]:
+    """Worker entry point: solve one chunk of (profile id, optimize_budget kwargs)."""
+    solved = []
+    for profile_id, inputs in problems:
+        try:
+            digest = problem_hash(canonical_problem(**inputs))
+            solved.append((profile_id, digest, optimize_budget(**inputs, timeout=settings.SOLVER_TIMEOUT)))
+        except Exception:
+            logger.exception("Re-optimizing profile %s failed", profile_id)
+            solved.append((profile_id, None, None))
+    return solved
+
+
+def stream_profile_inputs(
+    db: Session,
+    after_id: int,
+    optimization_mode: str,
+    chunk_size: int
+) -> Iterator[list[tuple[int, dict]]]:
+    """
+    Yield chunks of (profile id, optimize_budget kwargs) in profile id order.
+
+    Each chunk is one keyset query of chunk_size profiles, with expenses and
+    goals loaded by one SELECT ... IN per relationship, read in full before
+    it is yielded. No cursor stays open while the caller writes, so reads and
+    writes can share a session (and SQLite's single writer lock).
+    """
+    while True:
+        profiles = db.scalars(
+            select(BudgetProfile)
+            .where(BudgetProfile.id > after_id)
+            .order_by(BudgetProfile.id)
+            .limit(chunk_size)
+            .options(
+                selectinload(BudgetProfile.fixed_expenses),
+                selectinload(BudgetProfile.variable_expenses),
+                selectinload(BudgetProfile.financial_goals)
+            )
+        ).all()
+        if not profiles:
+            return
+        after_id = profiles[-1].id
+        yield [
+            (profile.id, optimization_inputs(ProfileSnapshot.from_model(profile), optimization_mode))
+            for profile in profiles
+        ]
+
+
+def store_solved_chunk(db: Session, solved: list[SolvedProfile]) -> int:
+    """
+    Bulk insert result rows for a solved chunk. The caller commits.
+
+    Follows result_store.store_result: payloads are shared through
+    optimization_solutions, and a profile whose latest result already has
+    the same content gets no new row.
+
+    Returns:
+        Number of result rows inserted
+    """
+    rows = [
+        (profile_id, digest, result, content_hash(result))
+        for profile_id, digest, result in solved
+        if result is not None and result["status"] == "optimal"
+    ]
+    if not rows:
+        return 0
+
+    latest_ids = (
+        select(func.max(OptimizationResult.id))
+        .where(OptimizationResult.profile_id.in_([row[0] for row in rows]))
+        .group_by(OptimizationResult.profile_id)
+    )
+    latest_hashes = dict(db.execute(
+        select(OptimizationResult.profile_id, OptimizationResult.result_hash)
+        .where(OptimizationResult.id.in_(latest_ids))
+    ).all())
+    rows = [row for row in rows if latest_hashes.get(row[0]) != row[3]]
+    if not rows:
+        return 0
+
+    payloads = {result_digest: result for _, _, result, result_digest in rows}
+    solution_ids = _solution_ids(db, payloads.keys())
+    missing = [
+        {"content_hash": result_digest, "result_json": compact_result(result)}
+        for result_digest, result in payloads.items()
+        if result_digest not in solution_ids
+    ]
+    if missing:
+        if db.get_bind().dialect.name == "postgresql":
+            # The API may store the same content concurrently
+            stmt = pg_insert(OptimizationSolution).on_conflict_do_nothing(index_elements=["content_hash"])
+        else:
+            stmt = insert(OptimizationSolution)
+        db.execute(stmt, missing)
+        solution_ids.update(_solution_ids(db, [row["content_hash"] for row in missing]))
+
+    db.execute(insert(OptimizationResult), [
+        {
+            "profile_id": profile_id,
+            "solution_id": solution_ids[result_digest],
+            "problem_hash": digest,
+            "result_hash": result_digest,
+            **result_summary(result)
+        }
+        for profile_id, digest, result, result_digest in rows
+    ])
+    return len(rows)
+
+
+def _solution_ids(db: Session, digests) -> dict[str, int]:
+    return dict(db.execute(
+        select(OptimizationSolution.content_hash, OptimizationSolution.id)
+        .where(OptimizationSolution.content_hash.in_(list(digests)))
+    ).all())
+
+
+def open_run(db: Session, optimization_mode: str, restart: bool = False) -> ReoptimizationRun:
+    """Resume the unfinished run for this mode, or start a new one. Commits."""
+    run = db.query(ReoptimizationRun).filter(
+        ReoptimizationRun.status == "running",
+        ReoptimizationRun.optimization_mode == optimization_mode
+    ).order_by(ReoptimizationRun.id.desc()).first()
+
+    if run is not None and restart:
+        run.status = "abandoned"
+        run = None
+
+    if run is None:
+        run = ReoptimizationRun(
+            status="running",
+            optimization_mode=optimization_mode,
+            last_profile_id=0,
+            profiles_processed=0,
+            profiles_failed=0,
+            results_inserted=0
+        )
+        db.add(run)
+
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def run_reoptimization(
+    optimization_mode: str = "max_savings",
+    chunk_size: int = settings.REOPTIMIZE_CHUNK_SIZE,
+    workers: int = settings.REOPTIMIZE_WORKERS,
+    restart: bool = False,
+    session_factory: Callable[[], Session] = SessionLocal
+) -> dict:
+    """
+    Re-optimize every profile after the run's checkpoint.
+
+    At most 2 * workers chunks are in flight, so memory is bounded by the
+    chunk size rather than the number of profiles. Chunks are committed in
+    profile id order together with the checkpoint.
+
+    Returns:
+        Run summary including throughput in profiles per second
+    """
+    with session_factory() as db:
+        run = open_run(db, optimization_mode, restart)
+        if run.last_profile_id:
+            logger.info("Resuming run %s after profile %s", run.id, run.last_profile_id)
+
+        start = time.perf_counter()
+        processed = 0
+
+        def commit_chunk(solved: list[SolvedProfile]) -> None:
+            nonlocal processed
+            inserted = store_solved_chunk(db, solved)
+            run.last_profile_id = max(profile_id for profile_id, _, _ in solved)
+            run.profiles_processed += len(solved)
+            run.profiles_failed += sum(1 for _, _, result in solved if result is None)
+            run.results_inserted += inserted
+            db.commit()
+
+            processed += len(solved)
+            elapsed = time.perf_counter() - start
+            logger.info(
+                "Run %s: %d profiles in %.1fs (%.1f profiles/s), checkpoint at profile %s",
+                run.id, processed, elapsed, processed / elapsed, run.last_profile_id
+            )
+
+        chunks = stream_profile_inputs(db, run.last_profile_id, optimization_mode, chunk_size)
+        if workers <= 0:
+            for chunk in chunks:
+                commit_chunk(solve_profiles(chunk))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                in_flight = deque()
+                for chunk in chunks:
+                    in_flight.append(pool.submit(solve_profiles, chunk))
+                    if len(in_flight) >= 2 * workers:
+                        commit_chunk(in_flight.popleft().result())
+                while in_flight:
+                    commit_chunk(in_flight.popleft().result())
+
+        elapsed = time.perf_counter() - start
+        run.status = "completed"
+        run.finished_at = datetime.now(timezone.utc)
+        db.commit()
+
+        return {
+            "run_id": run.id,
+            "profiles_processed": run.profiles_processed,
+            "profiles_failed": run.profiles_failed,
+            "results_inserted": run.results_inserted,
+            "elapsed_seconds": round(elapsed, 3),
+            "profiles_per_second": round(processed / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-optimize every stored budget profile")
+    parser.add_argument("--mode", default="max_savings", choices=["max_savings", "balanced", "fastest_goal"])
+    parser.add_argument("--chunk-size", type=int, default=settings.REOPTIMIZE_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=settings.REOPTIMIZE_WORKERS)
+    parser.add_argument("--restart", action="store_true", help="abandon an unfinished run instead of resuming it")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    summary = run_reoptimization(args.mode, args.chunk_size, args.workers, args.restart)
+    logger.info(
+        "Run %s done: %d profiles (%d failed), %d results inserted in %.1fs (%.1f profiles/s)",
+        summary["run_id"], summary["profiles_processed"], summary["profiles_failed"],
+        summary["results_inserted"], summary["elapsed_seconds"], summary["profiles_per_second"]
+    )
+
+
+if __name__ == "__main__":
+    main()
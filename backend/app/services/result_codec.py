@@ -0,0 +1,128 @@
+"""
+Compact storage encoding of optimization result payloads.
+
+An optimal result repeats every category name in three dictionaries and
+carries a projected_savings series as long as the goal horizon, although the
+series is just monthly savings times the month number. Stored payloads
+(optimization_solutions.result_json) therefore use a versioned compact form:
+
+    v               format version
+    categories      category dictionary, each name stored once
+    spending        [[category index, ...], [amount, ...]]
+    fixed           [[category index, ...], [amount, ...]]
+    savings_series  [horizon, rate]; month i is round(rate * i, 2)
+
+income_allocation is dropped when it equals the totals it repeats. Derived
+parts are only dropped when re-deriving them reproduces the original exactly,
+so expand_result(compact_result(r)) == r for every r. Payloads without "v"
+are legacy full results and pass through expand_result unchanged.
+"""
+import math
+
+FORMAT_VERSION = 1
+
+# Full-form keys replaced by compact fields
+_EXPANDED_KEYS = ("spending_allocation", "fixed_expenses", "projected_savings", "income_allocation")
+
+# Key order of optimizer._optimal_result, restored on expansion
+_KEY_ORDER = (
+    "status", "message", "monthly_savings", "spending_allocation", "total_monthly_spending",
+    "months_to_goal", "projected_savings", "fixed_expenses", "total_fixed_expenses", "income_allocation"
+)
+
+
+def is_compact(payload: dict) -> bool:
+    return "v" in payload
+
+
+def compact_result(result: dict) -> dict:
+    """Encode a full result payload for storage."""
+    if is_compact(result):
+        return result
+    if result.get("status") != "optimal":
+        return {"v": FORMAT_VERSION, **result}
+
+    compact = {"v": FORMAT_VERSION}
+    compact.update((key, value) for key, value in result.items() if key not in _EXPANDED_KEYS)
+
+    categories = list(dict.fromkeys([*result["spending_allocation"], *result["fixed_expenses"]]))
+    index = {cat: i for i, cat in enumerate(categories)}
+    compact["categories"] = categories
+    compact["spending"] = _columns(result["spending_allocation"], index)
+    compact["fixed"] = _columns(result["fixed_expenses"], index)
+
+    series = result["projected_savings"]
+    rate = _series_rate(series)
+    if rate is not None:
+        compact["savings_series"] = [len(series), rate]
+    else:
+        compact["projected_savings"] = series
+
+    if result["income_allocation"] != _income_allocation(compact, result["income_allocation"]["variable_expenses"]):
+        compact["income_allocation"] = result["income_allocation"]
+    else:
+        compact["variable_total"] = result["income_allocation"]["variable_expenses"]
+
+    return compact
+
+
+def expand_result(payload: dict) -> dict:
+    """Decode a stored payload, compact or legacy, into the full result form."""
+    if not is_compact(payload):
+        return payload
+
+    compact = dict(payload)
+    compact.pop("v")
+    if compact.get("status") != "optimal":
+        return compact
+
+    categories = compact.pop("categories")
+    spending = compact.pop("spending")
+    fixed = compact.pop("fixed")
+    if "savings_series" in compact:
+        horizon, rate = compact.pop("savings_series")
+        projected_savings = [round(rate * i, 2) for i in range(1, horizon + 1)]
+    else:
+        projected_savings = compact.pop("projected_savings")
+    if "variable_total" in compact:
+        income_allocation = _income_allocation(compact, compact.pop("variable_total"))
+    else:
+        income_allocation = compact.pop("income_allocation")
+
+    result = {
+        **compact,
+        "spending_allocation": {categories[i]: amount for i, amount in zip(*spending)},
+        "projected_savings": projected_savings,
+        "fixed_expenses": {categories[i]: amount for i, amount in zip(*fixed)},
+        "income_allocation": income_allocation
+    }
+    ordered = {key: result.pop(key) for key in _KEY_ORDER if key in result}
+    return {**ordered, **result}
+
+
+def _columns(amounts: dict[str, float], index: dict[str, int]) -> list[list]:
+    return [[index[cat] for cat in amounts], list(amounts.values())]
+
+
+def _series_rate(series: list[float]) -> float | None:
+    """A rate whose rounded multiples reproduce the series exactly, or None."""
+    if not series:
+        return 0.0
+
+    # Each rounded element bounds the rate; any rate inside all bounds works
+    low = max((value - 0.005) / i for i, value in enumerate(series, 1))
+    high = min((value + 0.005) / i for i, value in enumerate(series, 1))
+    if low > high:
+        return None
+    rate = (low + high) / 2
+    if not math.isfinite(rate) or any(round(rate * i, 2) != value for i, value in enumerate(series, 1)):
+        return None
+    return rate
+
+
+def _income_allocation(compact: dict, variable_total: float) -> dict:
+    return {
+        "fixed_expenses": compact.get("total_fixed_expenses"),
+        "variable_expenses": variable_total,
+        "savings": compact.get("monthly_savings")
+    }
@@ -0,0 +1,214 @@
+import base64
+import json
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased, joinedload
+
+from ..models.budget import BudgetProfile, OptimizationResult, OptimizationSolution
+from .optimizer import content_hash, reorder_result
+from .result_codec import compact_result, expand_result
+
+
+def find_solved_result(
+    db: Session,
+    problem_digest: str,
+    fixed_expenses: dict[str, float],
+    variable_categories: dict[str, tuple[float, float]]
+) -> dict | None:
+    """
+    Look up a stored result for an identical problem solved by any worker.
+
+    Args:
+        db: Database session
+        problem_digest: optimizer.problem_hash of the canonical problem
+        fixed_expenses: Caller's fixed expenses, to restore their order
+        variable_categories: Caller's variable categories, to restore their order
+
+    Returns:
+        The stored result payload, or None if this problem was never solved
+    """
+    solution = (
+        db.query(OptimizationSolution)
+        .join(OptimizationResult, OptimizationResult.solution_id == OptimizationSolution.id)
+        .filter(OptimizationResult.problem_hash == problem_digest)
+        .first()
+    )
+    if solution is None:
+        return None
+
+    return reorder_result(expand_result(solution.result_json), fixed_expenses, variable_categories)
+
+
+def latest_result(db: Session, profile_id: int) -> dict | None:
+    """The full payload of the profile's newest result, or None if it has none."""
+    latest = (
+        db.query(OptimizationResult)
+        .options(joinedload(OptimizationResult.solution))
+        .filter(OptimizationResult.profile_id == profile_id)
+        .order_by(OptimizationResult.created_at.desc(), OptimizationResult.id.desc())
+        .first()
+    )
+    if latest is None:
+        return None
+    return expand_result(latest.solution.result_json)
+
+
+def result_summary(result: dict) -> dict:
+    """OptimizationResult summary column values for a result payload."""
+    return {
+        "status": result.get("status"),
+        "monthly_savings": result.get("monthly_savings"),
+        "months_to_goal": result.get("months_to_goal"),
+        "total_monthly_spending": result.get("total_monthly_spending"),
+    }
+
+
+def store_result(
+    db: Session,
+    profile_id: int,
+    result: dict,
+    problem_digest: str | None = None
+) -> OptimizationResult:
+    """
+    Record an optimization result for a profile without duplicating payloads.
+
+    The payload is stored once per distinct content in optimization_solutions,
+    in result_codec's compact form, and shared by every result row that
+    produced it. If the profile's latest
+    result already has the same content, that row is returned and nothing is
+    inserted. The caller commits.
+    """
+    result_digest = content_hash(result)
+
+    latest = (
+        db.query(OptimizationResult)
+        .filter(OptimizationResult.profile_id == profile_id)
+        .order_by(OptimizationResult.created_at.desc(), OptimizationResult.id.desc())
+        .first()
+    )
+    if latest is not None and latest.result_hash == result_digest:
+        if latest.problem_hash is None:
+            latest.problem_hash = problem_digest
+        return latest
+
+    opt_result = OptimizationResult(
+        profile_id=profile_id,
+        solution=_get_or_create_solution(db, result_digest, result),
+        problem_hash=problem_digest,
+        result_hash=result_digest,
+        **result_summary(result)
+    )
+    db.add(opt_result)
+    return opt_result
+
+
+def _get_or_create_solution(db: Session, digest: str, result: dict) -> OptimizationSolution:
+    solution = db.query(OptimizationSolution).filter(OptimizationSolution.content_hash == digest).first()
+    if solution is not None:
+        return solution
+
+    # Another worker may insert the same content concurrently; the unique
+    # constraint on content_hash decides and the loser reuses the winner's row
+    try:
+        with db.begin_nested():
+            solution = OptimizationSolution(content_hash=digest, result_json=compact_result(result))
+            db.add(solution)
+        return solution
+    except IntegrityError:
+        return db.query(OptimizationSolution).filter(OptimizationSolution.content_hash == digest).one()
+
+
+_HISTORY_COLUMNS = (
+    OptimizationResult.id,
+    OptimizationResult.profile_id,
+    OptimizationResult.created_at,
+    OptimizationResult.status,
+    OptimizationResult.monthly_savings,
+    OptimizationResult.months_to_goal,
+    OptimizationResult.total_monthly_spending,
+)
+
+
+def encode_history_cursor(result_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([result_id]).encode()).decode()
+
+
+def decode_history_cursor(cursor: str) -> int:
+    """Raises ValueError for a malformed cursor."""
+    try:
+        (result_id,) = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(result_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def history_page(
+    db: Session,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None,
+    include_result: bool = False,
+    result_id: int | None = None
+) -> tuple[list[dict], str | None]:
+    """
+    One page of the user's optimization results, newest first.
+
+    Pages are keyset-paginated on (created_at, id). The cursor carries the
+    last row's id and its created_at is read back from the table, so the
+    bound compares in the column's stored form on every backend (SQLite
+    keeps server-default timestamps as text without microseconds). Results
+    are filtered on the user's profile id, so the (profile_id, created_at
+    DESC, id DESC) index serves the query without sorting and deep pages
+    cost the same as the first. Only summary columns are read unless
+    include_result is set, and stored payloads are only expanded then.
+
+    Args:
+        db: Database session
+        user_id: Owner of the results
+        limit: Page size
+        cursor: next_cursor of the previous page
+        include_result: Also return each full result payload
+        result_id: Restrict to this one result
+
+    Returns:
+        (rows as dicts, cursor of the next page or None on the last page)
+
+    Raises:
+        ValueError: cursor is malformed
+    """
+    columns = _HISTORY_COLUMNS + ((OptimizationSolution.result_json,) if include_result else ())
+    profile_id = (
+        select(BudgetProfile.id)
+        .where(BudgetProfile.user_id == user_id)
+        .order_by(BudgetProfile.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = select(*columns).where(OptimizationResult.profile_id == profile_id)
+    if include_result:
+        stmt = stmt.join(OptimizationSolution, OptimizationSolution.id == OptimizationResult.solution_id)
+    if result_id is not None:
+        stmt = stmt.where(OptimizationResult.id == result_id)
+    if cursor is not None:
+        last_id = decode_history_cursor(cursor)
+        last = aliased(OptimizationResult)
+        last_created_at = select(last.created_at).where(last.id == last_id).scalar_subquery()
+        stmt = stmt.where(
+            tuple_(OptimizationResult.created_at, OptimizationResult.id) < tuple_(last_created_at, last_id)
+        )
+
+    rows = db.execute(
+        stmt.order_by(OptimizationResult.created_at.desc(), OptimizationResult.id.desc()).limit(limit + 1)
+    ).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_history_cursor(rows[-1]["id"])
+
+    items = [dict(row) for row in rows]
+    if include_result:
+        for item in items:
+            item["result_json"] = expand_result(item["result_json"])
+    return items, next_cursor
@@ -0,0 +1,86 @@
+from pydantic import ValidationError
+
+from ..schemas.optimization import (
+    optimization_response_content,
+    ScenarioRequest,
+    ScenarioDelta,
+    BatchScenarioRequest
+)
+from .optimizer import BATCH_BUDGET_EXCEEDED
+
+
+def scenario_inputs(request: ScenarioRequest) -> dict:
+    """Convert a scenario request into optimize_budget keyword arguments."""
+    # Convert Decimal to float for optimization
+    return {
+        "monthly_income": float(request.monthly_income),
+        "fixed_expenses": {
+            cat: float(amt) for cat, amt in request.fixed_expenses.items()
+        },
+        "variable_categories": {
+            cat: (float(bounds[0]), float(bounds[1]))
+            for cat, bounds in request.variable_categories.items()
+        },
+        "savings_goal": float(request.savings_goal),
+        "months_to_goal": request.months_to_goal,
+        "optimization_mode": request.optimization_mode
+    }
+
+
+def apply_scenario_delta(base: ScenarioRequest, delta: ScenarioDelta) -> ScenarioRequest | str:
+    """Merge a delta into the base scenario, or return the validation error message."""
+    merged = base.model_dump()
+    for field in ("monthly_income", "savings_goal", "months_to_goal", "optimization_mode"):
+        value = getattr(delta, field)
+        if value is not None:
+            merged[field] = value
+
+    for field in ("fixed_expenses", "variable_categories"):
+        for cat, value in getattr(delta, field).items():
+            if value is None:
+                merged[field].pop(cat, None)
+            else:
+                merged[field][cat] = value
+
+    try:
+        return ScenarioRequest.model_validate(merged)
+    except ValidationError as exc:
+        return f"Invalid scenario: {exc.errors()[0]['msg']}"
+
+
+def expand_batch(request: BatchScenarioRequest) -> list[ScenarioRequest | str]:
+    """Resolve a batch request to its scenarios; invalid ones become error messages."""
+    if request.scenarios is not None:
+        return list(request.scenarios)
+    return [apply_scenario_delta(request.base, delta) for delta in request.deltas]
+
+
+def batch_response(
+    scenarios: list[ScenarioRequest | str],
+    solved: list[dict],
+    elapsed_seconds: float
+) -> dict:
+    """
+    Assemble the BatchScenarioResponse content in input order.
+
+    Results skip model validation (see optimization_response_content); large
+    batches would otherwise spend longer validating than serializing.
+
+    Args:
+        scenarios: Output of expand_batch
+        solved: optimize_budget results for the valid scenarios, in order
+        elapsed_seconds: Wall-clock time spent on the batch
+    """
+    solved_iter = iter(solved)
+    results = [
+        {"status": "error", "message": scenario} if isinstance(scenario, str) else next(solved_iter)
+        for scenario in scenarios
+    ]
+
+    return {
+        "results": [optimization_response_content(result) for result in results],
+        "solved": sum(1 for result in results if result["status"] != "error"),
+        "failed": sum(1 for result in results if result["status"] == "error"),
+        "budget_exhausted": any(result.get("message") == BATCH_BUDGET_EXCEEDED for result in results),
+        "elapsed_seconds": round(elapsed_seconds, 4)
+    }
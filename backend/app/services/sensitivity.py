@@ -0,0 +1,160 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Literal
+
+from .solvers import BudgetModel
+
+INCOME_PARAMETER = "monthly_income"
+
+
+@dataclass(frozen=True)
+class SavingsCurve:
+    """
+    Optimal monthly savings as a piecewise-linear function of one parameter.
+
+    Internally the curve is stored against disposable income
+    R = monthly_income - total_fixed, where it is infeasible below the first
+    breakpoint, linear between breakpoints and has slope 1 (every extra dollar
+    is saved) beyond the last one. The swept parameter maps to R through
+    R = offset + direction * value (direction is +1 for income, -1 for a
+    fixed expense).
+    """
+    parameter: str
+    offset: float
+    direction: int
+    disposable: list[float]
+    savings: list[float]
+    allocations: list[dict[str, float]]
+
+    def to_disposable(self, value: float) -> float:
+        return self.offset + self.direction * value
+
+    def to_parameter(self, disposable: float) -> float:
+        return (disposable - self.offset) * self.direction
+
+    @property
+    def feasibility_limit(self) -> float | None:
+        """Parameter value at which the budget becomes (or stops being) feasible."""
+        return self.to_parameter(self.disposable[0]) if self.disposable else None
+
+    def breakpoints(self) -> list[tuple[float, float, dict[str, float]]]:
+        """(parameter value, monthly savings, allocation) at each breakpoint, ascending by value."""
+        points = [
+            (self.to_parameter(r), s, alloc)
+            for r, s, alloc in zip(self.disposable, self.savings, self.allocations)
+        ]
+        return sorted(points, key=lambda point: point[0])
+
+    def evaluate(self, value: float) -> tuple[float, dict[str, float]] | None:
+        """
+        Optimal (monthly savings, allocation) at a parameter value, or None if
+        infeasible. Locating the segment is a binary search over breakpoints.
+        """
+        r = self.to_disposable(value)
+        if not self.disposable or r < self.disposable[0]:
+            return None
+
+        idx = bisect_right(self.disposable, r) - 1
+        if idx == len(self.disposable) - 1:
+            # Beyond the last breakpoint all extra income goes to savings
+            return self.savings[idx] + (r - self.disposable[idx]), dict(self.allocations[idx])
+
+        r0, r1 = self.disposable[idx], self.disposable[idx + 1]
+        t = (r - r0) / (r1 - r0)
+        left, right = self.allocations[idx], self.allocations[idx + 1]
+        allocation = {cat: left[cat] + t * (right[cat] - left[cat]) for cat in left}
+        return self.savings[idx] + t * (self.savings[idx + 1] - self.savings[idx]), allocation
+
+
+def savings_curve(
+    monthly_income: float,
+    fixed_expenses: dict[str, float],
+    variable_categories: dict[str, tuple[float, float]],
+    savings_goal: float = 0,
+    months_to_goal: int = 12,
+    optimization_mode: Literal["max_savings", "balanced", "fastest_goal"] = "max_savings",
+    parameter: str = INCOME_PARAMETER
+) -> SavingsCurve:
+    """
+    Compute the whole optimal-savings curve for a sweep of monthly income or
+    of one fixed expense in a single pass.
+
+    Only disposable income R = income - fixed enters the LP, so both sweeps
+    share one curve. The first breakpoint is the minimum feasible R (every
+    category at its minimum plus the goal's savings floor). In "balanced"
+    mode each further breakpoint is where the next category that is worth
+    more than a dollar of savings reaches its maximum; savings stay at the
+    floor until then. In the other modes savings grow one-for-one from the
+    first breakpoint.
+
+    Args:
+        monthly_income: Total monthly income (ignored when sweeping income)
+        fixed_expenses: Dictionary of fixed expense categories and amounts
+        variable_categories: Dictionary of variable categories with (min, max) bounds
+        savings_goal: Target savings amount
+        months_to_goal: Number of months to reach savings goal
+        optimization_mode: Optimization objective ("max_savings", "balanced", "fastest_goal")
+        parameter: "monthly_income" or the name of a fixed expense category
+
+    Returns:
+        The savings curve; it has no breakpoints when no parameter value is feasible
+    """
+    total_fixed = sum(fixed_expenses.values())
+    if parameter == INCOME_PARAMETER:
+        offset, direction = -total_fixed, 1
+    elif parameter in fixed_expenses:
+        offset, direction = monthly_income - (total_fixed - fixed_expenses[parameter]), -1
+    else:
+        raise ValueError(f"Unknown sweep parameter '{parameter}'")
+
+    min_monthly_savings = 0.0
+    if savings_goal > 0 and months_to_goal > 0:
+        min_monthly_savings = savings_goal / months_to_goal
+
+    model = BudgetModel(
+        monthly_income=monthly_income,
+        total_fixed=total_fixed,
+        variable_categories=variable_categories,
+        min_monthly_savings=min_monthly_savings,
+        optimization_mode=optimization_mode
+    )
+
+    disposable: list[float] = []
+    savings: list[float] = []
+    allocations: list[dict[str, float]] = []
+
+    if not any(min_amt > max_amt for min_amt, max_amt in variable_categories.values()):
+        allocation = {cat: min_amt for cat, (min_amt, max_amt) in variable_categories.items()}
+        r = sum(allocation.values()) + min_monthly_savings
+        disposable.append(r)
+        savings.append(min_monthly_savings)
+        allocations.append(dict(allocation))
+
+    if disposable and optimization_mode == "balanced":
+        gains = []
+        for cat, (min_amt, max_amt) in variable_categories.items():
+            if max_amt == 0:
+                raise ValueError(f"Category '{cat}' has a zero maximum, which 'balanced' mode cannot weight")
+            gain = model.objective_weight(max_amt) - 1.0
+            if gain > 0:
+                gains.append((gain, cat))
+
+        # Categories fill up one after another, best first
+        for gain, cat in sorted(gains, reverse=True):
+            min_amt, max_amt = variable_categories[cat]
+            if max_amt == min_amt:
+                continue
+            r += max_amt - min_amt
+            allocation[cat] = max_amt
+            disposable.append(r)
+            savings.append(min_monthly_savings)
+            allocations.append(dict(allocation))
+
+    return SavingsCurve(
+        parameter=parameter,
+        offset=offset,
+        direction=direction,
+        disposable=disposable,
+        savings=savings,
+        allocations=allocations
+    )
@@ -0,0 +1,45 @@
+import json
+import time
+from typing import Iterator
+
+from ..core.config import settings
+from ..core.metrics import observe_solve
+from ..core.tracing import current_trace_id, write_jsonl
+from .optimizer import canonical_problem
+
+
+def record_solve(inputs: dict, result: dict, seconds: float) -> None:
+    """
+    Record one optimize_budget call made with the given keyword arguments.
+
+    Every call is observed in the solve metrics. A call taking at least
+    SLOW_SOLVE_SECONDS also has its canonical problem appended to
+    SLOW_SOLVE_FILE, so the case can be replayed offline with
+    ``python -m benchmarks.compare_backends --problems <file>``.
+    """
+    observe_solve(inputs, result, seconds)
+    if not settings.SLOW_SOLVE_SECONDS or seconds < settings.SLOW_SOLVE_SECONDS:
+        return
+    write_jsonl(settings.SLOW_SOLVE_FILE, {
+        "captured_at": time.time(),
+        "trace_id": current_trace_id(),
+        "seconds": round(seconds, 6),
+        "engine": settings.SOLVER_ENGINE,
+        "status": result.get("status"),
+        "problem": canonical_problem(**inputs),
+    })
+
+
+def load_slow_solves(path: str) -> Iterator[dict]:
+    """Records written by record_solve, with the problem ready for optimize_budget(**problem)."""
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            problem = record["problem"]
+            # JSON turned the (min, max) bounds into lists
+            problem["variable_categories"] = {
+                cat: tuple(bounds) for cat, bounds in problem["variable_categories"].items()
+            }
+            yield record
@@ -0,0 +1,142 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+
+
+class SolverPoolBusy(Exception):
+    """Raised when the solver pool's wait queue is full."""
+
+
+class SolverPoolTimeout(Exception):
+    """Raised when a solver task does not finish within its timeout."""
+
+
+def _warm_worker() -> None:
+    """Worker initializer: import the solver stack once per process."""
+    import pulp  # noqa: F401  (solvers imports it lazily)
+    from . import optimizer, solvers  # noqa: F401
+
+
+def _ping() -> bool:
+    return True
+
+
+class SolverPool:
+    """
+    Process pool that runs solver work off the request threadpool.
+
+    Routes await run(); the event loop thread is never blocked and no
+    threadpool slot is held while a solve is in flight. Up to size tasks run
+    at once and up to queue_depth more wait; beyond that run() raises
+    SolverPoolBusy. A size of 0 solves in the request threadpool instead.
+
+    A timed-out task cannot be interrupted in its worker, so until it
+    finishes it is counted as stuck and still takes a slot from admission.
+    """
+
+    def __init__(self, size: int, queue_depth: int, task_timeout: float):
+        self.size = size
+        self.queue_depth = queue_depth
+        self.task_timeout = task_timeout
+        self.pending = 0
+        self.stuck = 0
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self) -> None:
+        """Spawn the workers and wait until each has imported the solver stack."""
+        if self.size <= 0 or self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.size,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker
+        )
+        for future in [self._executor.submit(_ping) for _ in range(self.size)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        task_timeout: float | None = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Run fn(*args, **kwargs) in a worker process.
+
+        Args:
+            fn: Picklable module-level function
+            task_timeout: Seconds to wait for the result, defaults to the pool's task_timeout
+
+        Raises:
+            SolverPoolBusy: The wait queue is full
+            SolverPoolTimeout: The task did not finish in time
+        """
+        if self.size <= 0:
+            return await run_in_threadpool(fn, *args, **kwargs)
+
+        if self.pending + self.stuck >= self.size + self.queue_depth:
+            raise SolverPoolBusy()
+
+        self.pending += 1
+        try:
+            if self._executor is None:
+                await run_in_threadpool(self.start)
+            future = self._executor.submit(functools.partial(fn, *args, **kwargs))
+            try:
+                # Shielded so a timeout leaves the worker's future alone and it can be tracked
+                return await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(future)), task_timeout or self.task_timeout
+                )
+            except asyncio.TimeoutError:
+                if not future.cancel():
+                    self._track_stuck(future)
+                raise SolverPoolTimeout() from None
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); replace the pool for later requests
+            self.shutdown()
+            raise
+        finally:
+            self.pending -= 1
+
+    def _track_stuck(self, future: Future) -> None:
+        """Hold a slot for a timed-out task still running in its worker until it finishes."""
+        loop = asyncio.get_running_loop()
+        self.stuck += 1
+
+        def release() -> None:
+            self.stuck -= 1
+
+        def on_done(_: Future) -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(release)
+
+        future.add_done_callback(on_done)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "queue_depth": self.queue_depth,
+            "pending": self.pending,
+            "stuck": self.stuck,
+            "started": self._executor is not None,
+        }
+
+
+solver_pool = SolverPool(
+    size=settings.SOLVER_POOL_SIZE,
+    queue_depth=settings.SOLVER_POOL_QUEUE_DEPTH,
+    task_timeout=settings.SOLVER_POOL_TASK_TIMEOUT
+)
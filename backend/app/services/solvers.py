@@ -0,0 +1,270 @@
+from dataclasses import dataclass
+from typing import Literal
+
+from ..core.profiling import phase
+
+# Tolerance used by the closed-form backend to detect degenerate models
+# (ties and borderline feasibility) that are left to the LP solver.
+CLOSED_FORM_TOLERANCE = 1e-9
+
+# Weight of the lifestyle-quality term in "balanced" mode.
+LIFESTYLE_WEIGHT = 0.3
+
+
+@dataclass(frozen=True)
+class BudgetModel:
+    """Solver-agnostic description of the budget LP."""
+    monthly_income: float
+    total_fixed: float
+    variable_categories: dict[str, tuple[float, float]]
+    min_monthly_savings: float
+    optimization_mode: Literal["max_savings", "balanced", "fastest_goal"]
+
+    def objective_weight(self, max_amt: float) -> float:
+        """Objective coefficient of a spending variable (savings has weight 1)."""
+        if self.optimization_mode == "balanced":
+            return LIFESTYLE_WEIGHT / max_amt
+        return 0.0
+
+
+@dataclass(frozen=True)
+class Solution:
+    """
+    Raw solver output before it is turned into an API payload.
+
+    "not_solved" means the solver stopped (time limit, numerical trouble)
+    without proving optimality or infeasibility.
+    """
+    status: Literal["optimal", "infeasible", "not_solved"]
+    monthly_savings: float | None = None
+    spending_allocation: dict[str, float] | None = None
+
+
+class SolverBackend:
+    """
+    Base class for optimization backends.
+
+    solve() returns None when the backend cannot handle the model, in which
+    case optimize_budget falls back to the PuLP/CBC backend.
+    """
+    name: str = ""
+
+    def solve(self, model: BudgetModel, timeout: int) -> Solution | None:
+        raise NotImplementedError
+
+
+class PulpCbcBackend(SolverBackend):
+    """
+    Build the model with PuLP and solve it with the CBC subprocess.
+
+    PuLP is imported on first use, so processes that never fall back to CBC
+    do not pay for it.
+    """
+    name = "pulp"
+
+    def solve(self, model: BudgetModel, timeout: int) -> Solution | None:
+        from pulp import LpProblem, LpMaximize, LpVariable, lpSum, LpStatus, PULP_CBC_CMD
+
+        with phase("pulp_build"):
+            # Create the LP problem
+            prob = LpProblem("Budget_Optimization", LpMaximize)
+
+            # Decision variables for variable spending categories
+            spending = {}
+            for cat, (min_amt, max_amt) in model.variable_categories.items():
+                spending[cat] = LpVariable(
+                    f"spend_{cat}",
+                    lowBound=min_amt,
+                    upBound=max_amt
+                )
+
+            # Decision variable for monthly savings
+            savings = LpVariable("savings", lowBound=0)
+
+            # Objective function based on mode
+            if model.optimization_mode == "max_savings":
+                # Maximize savings
+                prob += savings, "Maximize_Savings"
+
+            elif model.optimization_mode == "balanced":
+                # Maximize savings while maintaining lifestyle quality
+                # Penalize being too far from maximum spending in each category
+                lifestyle_quality = lpSum([
+                    (1.0 / max_amt) * spending[cat]
+                    for cat, (min_amt, max_amt) in model.variable_categories.items()
+                ])
+                # Weighted objective: 70% savings, 30% lifestyle
+                prob += savings + LIFESTYLE_WEIGHT * lifestyle_quality, "Balanced_Objective"
+
+            elif model.optimization_mode == "fastest_goal":
+                # Minimize spending to maximize savings (same as max_savings but with tighter constraints)
+                prob += savings, "Fastest_Goal"
+
+            # Constraint 1: Budget balance
+            # Total spending + savings = income
+            total_variable_spending = lpSum(list(spending.values()))
+            prob += total_variable_spending + savings + model.total_fixed == model.monthly_income, "Budget_Balance"
+
+            # Constraint 2: Goal achievement
+            # Monthly savings must be enough to reach goal in specified months
+            if model.min_monthly_savings > 0:
+                prob += savings >= model.min_monthly_savings, "Goal_Constraint"
+
+        # Solve the problem
+        solver = PULP_CBC_CMD(msg=0, timeLimit=timeout)
+        with phase("cbc"):
+            prob.solve(solver)
+
+        status = LpStatus[prob.status]
+        if status == "Infeasible":
+            return Solution(status="infeasible")
+        if status != "Optimal":
+            # "Not Solved" when the time limit hits first, "Undefined" on solver failure
+            return Solution(status="not_solved")
+
+        return Solution(
+            status="optimal",
+            monthly_savings=savings.varValue,
+            spending_allocation={cat: var.varValue for cat, var in spending.items()}
+        )
+
+
+class ClosedFormBackend(SolverBackend):
+    """
+    Solve the budget LP analytically without launching a solver.
+
+    Substituting the budget balance s = income - fixed - sum(x[i]) turns every
+    mode into a bounded fractional knapsack: each category starts at its
+    minimum and the remaining slack above the goal's savings floor is handed to
+    the categories whose objective coefficient beats a dollar of savings, best
+    first. In "max_savings" and "fastest_goal" no category does, so the
+    solution is simply every category at its minimum.
+
+    Degenerate models (inverted bounds, tied objective coefficients at the
+    margin, feasibility within tolerance, zero "balanced" maxima) are left to
+    CBC so both backends always agree.
+    """
+    name = "closed_form"
+
+    def solve(self, model: BudgetModel, timeout: int) -> Solution | None:
+        categories = model.variable_categories
+
+        if any(min_amt > max_amt for min_amt, max_amt in categories.values()):
+            return None
+
+        spending_allocation = {cat: min_amt for cat, (min_amt, max_amt) in categories.items()}
+        slack = (
+            model.monthly_income
+            - model.total_fixed
+            - sum(spending_allocation.values())
+            - model.min_monthly_savings
+        )
+
+        if abs(slack) <= CLOSED_FORM_TOLERANCE:
+            return None
+        if slack < 0:
+            return Solution(status="infeasible")
+
+        if model.optimization_mode == "balanced":
+            # Net gain of moving one dollar from savings into category i
+            gains = []
+            for cat, (min_amt, max_amt) in categories.items():
+                if max_amt == 0:
+                    return None
+                gain = model.objective_weight(max_amt) - 1.0
+                if abs(gain) <= CLOSED_FORM_TOLERANCE:
+                    return None
+                if gain > 0:
+                    gains.append((gain, cat))
+
+            gains.sort(reverse=True)
+            for idx, (gain, cat) in enumerate(gains):
+                if slack <= 0:
+                    break
+                min_amt, max_amt = categories[cat]
+                room = max_amt - min_amt
+                if room > slack:
+                    # Partially filled category: a tie with the next one makes the split arbitrary
+                    if idx + 1 < len(gains) and abs(gains[idx + 1][0] - gain) <= CLOSED_FORM_TOLERANCE:
+                        return None
+                    spending_allocation[cat] = min_amt + slack
+                    slack = 0.0
+                else:
+                    spending_allocation[cat] = max_amt
+                    slack -= room
+
+        return Solution(
+            status="optimal",
+            monthly_savings=model.monthly_income - model.total_fixed - sum(spending_allocation.values()),
+            spending_allocation=spending_allocation
+        )
+
+
+class HighsBackend(SolverBackend):
+    """
+    Solve the model in-process with scipy's HiGHS bindings.
+
+    The LP is passed as arrays, so no subprocess is launched and nothing is
+    written to disk. Requires scipy; models it cannot express (zero "balanced"
+    maxima) are left to CBC.
+    """
+    name = "highs"
+
+    def solve(self, model: BudgetModel, timeout: int) -> Solution | None:
+        import numpy as np
+        from scipy.optimize import linprog
+
+        categories = list(model.variable_categories.items())
+        if model.optimization_mode == "balanced" and any(max_amt == 0 for _, (_, max_amt) in categories):
+            return None
+
+        # Variables: x[0..n-1] spending, x[n] savings. linprog minimizes.
+        n = len(categories)
+        c = np.empty(n + 1)
+        c[:n] = [-model.objective_weight(max_amt) for _, (_, max_amt) in categories]
+        c[n] = -1.0
+
+        a_eq = np.ones((1, n + 1))
+        b_eq = np.array([model.monthly_income - model.total_fixed])
+        bounds = [(min_amt, max_amt) for _, (min_amt, max_amt) in categories]
+        bounds.append((model.min_monthly_savings, None))
+
+        if any(lo > hi for lo, hi in bounds[:n]):
+            return Solution(status="infeasible")
+
+        res = linprog(
+            c,
+            A_eq=a_eq,
+            b_eq=b_eq,
+            bounds=bounds,
+            method="highs",
+            options={"time_limit": float(timeout)}
+        )
+
+        if res.status == 2:
+            return Solution(status="infeasible")
+        if res.status != 0:
+            # Time limit or numerical failure: let CBC have a go
+            return None
+
+        return Solution(
+            status="optimal",
+            monthly_savings=float(res.x[n]),
+            spending_allocation={cat: float(res.x[i]) for i, (cat, _) in enumerate(categories)}
+        )
+
+
+SOLVER_BACKENDS: dict[str, SolverBackend] = {
+    backend.name: backend
+    for backend in (ClosedFormBackend(), PulpCbcBackend(), HighsBackend())
+}
+
+
+def get_solver_backend(name: str) -> SolverBackend:
+    """Look up a registered solver backend by name."""
+    try:
+        return SOLVER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown solver backend '{name}'. Available: {', '.join(SOLVER_BACKENDS)}"
+        ) from None
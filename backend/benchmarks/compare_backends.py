@@ -0,0 +1,106 @@
+"""
+Latency comparison of the optimizer's solver backends on identical inputs.
+
+With --problems, the inputs are the slow solves captured in production
+(SLOW_SOLVE_FILE) instead of synthetic ones, each in its recorded mode.
+
+Usage (from the backend directory):
+    python -m benchmarks.compare_backends --categories 5 50 500 --repeats 50
+    python -m benchmarks.compare_backends --problems traces/slow-solves-1234.jsonl
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.services.optimizer import build_budget_model
+from app.services.slow_solves import load_slow_solves
+from app.services.solvers import SOLVER_BACKENDS
+
+
+def synthetic_inputs(n_categories: int, seed: int = 0) -> dict:
+    """Generate a feasible optimize_budget input with n variable categories."""
+    rng = random.Random(seed)
+    variable_categories = {}
+    for i in range(n_categories):
+        min_amt = round(rng.uniform(0, 200), 2)
+        variable_categories[f"category_{i}"] = (min_amt, round(min_amt + rng.uniform(0, 300), 2))
+
+    fixed_expenses = {"rent": 1500.0, "insurance": 200.0}
+    min_spending = sum(min_amt for min_amt, _ in variable_categories.values())
+
+    return {
+        "monthly_income": round(sum(fixed_expenses.values()) + min_spending * 1.5 + 1000, 2),
+        "fixed_expenses": fixed_expenses,
+        "variable_categories": variable_categories,
+        "savings_goal": 6000.0,
+        "months_to_goal": 12,
+    }
+
+
+def compare(inputs: dict, repeats: int, backends: list[str]) -> list[dict]:
+    """Time every backend on the same model and check that they agree."""
+    model = build_budget_model(**inputs)
+    rows = []
+    reference = None
+
+    for name in backends:
+        backend = SOLVER_BACKENDS[name]
+        backend.solve(model, timeout=10)  # warm-up: lazy imports, solver binaries
+        timings = []
+        solution = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            solution = backend.solve(model, timeout=10)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        savings = round(solution.monthly_savings, 2) if solution and solution.monthly_savings is not None else None
+        if reference is None:
+            reference = savings
+
+        timings.sort()
+        rows.append({
+            "backend": name,
+            "categories": len(model.variable_categories),
+            "mode": model.optimization_mode,
+            "p50_ms": statistics.median(timings),
+            "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+            "mean_ms": statistics.fmean(timings),
+            "monthly_savings": savings,
+            "agrees": savings == reference,
+        })
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--modes", nargs="+", default=["max_savings", "balanced", "fastest_goal"])
+    parser.add_argument("--backends", nargs="+", default=list(SOLVER_BACKENDS))
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--problems", help="slow-solve capture file to replay instead of synthetic inputs")
+    args = parser.parse_args()
+
+    if args.problems:
+        cases = [record["problem"] for record in load_slow_solves(args.problems)]
+    else:
+        cases = [
+            {**synthetic_inputs(n_categories), "optimization_mode": mode}
+            for n_categories in args.categories
+            for mode in args.modes
+        ]
+
+    print(f"{'backend':<12} {'cats':>6} {'mode':<13} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}  savings")
+    for inputs in cases:
+        for row in compare(inputs, args.repeats, args.backends):
+            flag = "" if row["agrees"] else "  (differs)"
+            print(
+                f"{row['backend']:<12} {row['categories']:>6} {row['mode']:<13} "
+                f"{row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} {row['mean_ms']:>9.3f}  "
+                f"{row['monthly_savings']}{flag}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Micro-benchmark suite for optimize_budget across model sizes, modes and
+solver backends.
+
+Every combination of size (variable categories), case and optimization mode
+is solved by every backend through optimize_budget with the result cache
+cleared, so each call builds and solves the model. Cases:
+
+    feasible     income comfortably covers fixed costs and minimum spending
+    goal_bound   the savings goal leaves 1% of the slack, so its constraint is tight
+    infeasible   income falls short of fixed costs plus minimum spending
+
+Per combination the suite records latency percentiles and the Python peak
+memory of one solve (tracemalloc; the CBC subprocess is not included). Per
+backend it records the launch overhead: the latency of a one-category model,
+which for PuLP/CBC is almost entirely writing the model and starting the
+solver process.
+
+Results are written as JSON (--output), conventionally under
+benchmarks/results/ (git-ignored). Given a --baseline written by an earlier
+run, every p50 that got slower by more than --tolerance (and by more than
+--min-delta-ms) is reported as a regression, as is any change of result
+status, and the exit status is 1. No baseline is committed, since timings
+only compare on the machine that recorded them: record one before a change
+and compare against it after.
+
+Usage (from the backend directory):
+    python -m benchmarks.optimizer --output benchmarks/results/baseline.json
+    python -m benchmarks.optimizer --sizes 5 50 --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from app.services.optimizer import optimize_budget, result_cache
+from app.services.solvers import SOLVER_BACKENDS
+from benchmarks.compare_backends import synthetic_inputs
+
+CASES = ("feasible", "goal_bound", "infeasible")
+MODES = ("max_savings", "balanced", "fastest_goal")
+
+
+def case_inputs(n_categories: int, case: str, mode: str, seed: int = 0) -> dict:
+    """optimize_budget keyword arguments for one synthetic profile."""
+    inputs = {**synthetic_inputs(n_categories, seed), "optimization_mode": mode}
+    months = inputs["months_to_goal"]
+    fixed = sum(inputs["fixed_expenses"].values())
+    min_spending = sum(min_amt for min_amt, _ in inputs["variable_categories"].values())
+    slack = inputs["monthly_income"] - fixed - min_spending
+
+    if case == "feasible":
+        inputs["savings_goal"] = round(slack * 0.25 * months, 2)
+    elif case == "goal_bound":
+        inputs["savings_goal"] = round(slack * 0.99 * months, 2)
+    elif case == "infeasible":
+        inputs["monthly_income"] = round(fixed + min_spending * 0.9, 2)
+    else:
+        raise ValueError(f"Unknown case: {case}")
+    return inputs
+
+
+def _solve(inputs: dict, engine: str) -> tuple[float, dict]:
+    """Seconds for one uncached optimize_budget call, and its result."""
+    result_cache.clear()
+    started = time.perf_counter()
+    result = optimize_budget(**inputs, engine=engine)
+    return time.perf_counter() - started, result
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def run_case(inputs: dict, engine: str, repeats: int, min_repeats: int, case_seconds: float) -> dict:
+    """Time one input on one backend; stops early once case_seconds are spent (after min_repeats)."""
+    _solve(inputs, engine)  # warm-up: lazy imports, solver binaries
+
+    timings = []
+    status = None
+    spent = 0.0
+    while len(timings) < repeats and (len(timings) < min_repeats or spent < case_seconds):
+        seconds, result = _solve(inputs, engine)
+        timings.append(seconds * 1000)
+        spent += seconds
+        status = result["status"]
+
+    result_cache.clear()
+    tracemalloc.start()
+    try:
+        optimize_budget(**inputs, engine=engine)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "runs": len(timings),
+        "status": status,
+        "p50_ms": statistics.median(timings),
+        "p95_ms": _percentile(timings, 0.95),
+        "p99_ms": _percentile(timings, 0.99),
+        "mean_ms": statistics.fmean(timings),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def launch_overhead(engine: str, repeats: int) -> float:
+    """Median milliseconds to solve a one-category model: the backend's fixed cost per solve."""
+    inputs = case_inputs(1, "feasible", "max_savings")
+    _solve(inputs, engine)
+    return statistics.median(_solve(inputs, engine)[0] * 1000 for _ in range(repeats))
+
+
+def run_suite(args: argparse.Namespace) -> dict:
+    results = []
+    for engine in args.backends:
+        for n_categories in args.sizes:
+            for case in args.cases:
+                for mode in args.modes:
+                    row = run_case(
+                        case_inputs(n_categories, case, mode),
+                        engine,
+                        args.repeats,
+                        args.min_repeats,
+                        args.case_seconds
+                    )
+                    row = {
+                        "key": f"{engine}/{mode}/{case}/{n_categories}",
+                        "backend": engine,
+                        "mode": mode,
+                        "case": case,
+                        "categories": n_categories,
+                        **row,
+                    }
+                    results.append(row)
+                    print(
+                        f"{engine:<12} {n_categories:>6} {case:<11} {mode:<13} {row['status']:<11}"
+                        f"{row['p50_ms']:>10.3f} {row['p95_ms']:>10.3f} {row['p99_ms']:>10.3f} "
+                        f"{row['peak_kib']:>10.1f} {row['runs']:>5}",
+                        flush=True
+                    )
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "argv": sys.argv[1:],
+        },
+        "launch_overhead_ms": {engine: launch_overhead(engine, args.min_repeats * 5) for engine in args.backends},
+        "results": results,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list[str]:
+    """Regressions of report against baseline, as printable lines; cases missing from either are skipped."""
+    previous = {row["key"]: row for row in baseline["results"]}
+    regressions = []
+    for row in report["results"]:
+        old = previous.get(row["key"])
+        if old is None:
+            continue
+        if row["status"] != old["status"]:
+            regressions.append(f"{row['key']}: status {old['status']} -> {row['status']}")
+        delta = row["p50_ms"] - old["p50_ms"]
+        if delta > min_delta_ms and row["p50_ms"] > old["p50_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{row['key']}: p50 {old['p50_ms']:.3f}ms -> {row['p50_ms']:.3f}ms "
+                f"(+{delta / old['p50_ms']:.0%})"
+            )
+
+    for engine, overhead in report["launch_overhead_ms"].items():
+        old = baseline.get("launch_overhead_ms", {}).get(engine)
+        if old is not None and overhead - old > min_delta_ms and overhead > old * (1 + tolerance):
+            regressions.append(f"{engine} launch overhead: {old:.3f}ms -> {overhead:.3f}ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 50, 500, 5000])
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--backends", nargs="+", choices=list(SOLVER_BACKENDS), default=list(SOLVER_BACKENDS))
+    parser.add_argument("--repeats", type=int, default=50, help="maximum timed runs per combination")
+    parser.add_argument("--min-repeats", type=int, default=5)
+    parser.add_argument("--case-seconds", type=float, default=2.0, help="stop repeating a combination after this long")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative p50 slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(f"--baseline {args.baseline} does not exist; record one first with --output")
+
+    print(
+        f"{'backend':<12} {'cats':>6} {'case':<11} {'mode':<13} {'status':<11}"
+        f"{'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'peak KiB':>10} {'runs':>5}"
+    )
+    report = run_suite(args)
+    for engine, overhead in report["launch_overhead_ms"].items():
+        print(f"launch overhead {engine:<12} {overhead:.3f} ms")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
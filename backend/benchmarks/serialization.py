@@ -0,0 +1,139 @@
+"""
+Serialization time and response size of optimizer payloads, before and after
+the orjson fast path, with gzip and brotli sizes of the fast-path body.
+
+"before" replays FastAPI's previous route path: build a Decimal-typed
+OptimizationResponse, re-validate it against the response model, dump it in
+JSON mode and encode with the stdlib json module. "after" is what the routes
+now do: pick the response fields and render with FastJSONResponse.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization --horizons 12 120 360 --batch 1000 --repeats 200
+"""
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+from decimal import Decimal
+from typing import Callable, Literal
+
+import brotli
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.schemas.optimization import optimization_response_content
+from app.services.optimizer import _optimal_result
+from app.services.scenarios import batch_response
+
+
+class LegacyOptimizationResponse(BaseModel):
+    """OptimizationResponse as it was, with Decimal amounts."""
+    status: Literal["optimal", "infeasible", "error"]
+    message: str | None = None
+    monthly_savings: Decimal | None = None
+    spending_allocation: dict[str, float] | None = None
+    total_monthly_spending: Decimal | None = None
+    months_to_goal: float | None = None
+    projected_savings: list[float] | None = None
+
+
+class LegacyBatchScenarioResponse(BaseModel):
+    results: list[LegacyOptimizationResponse]
+    solved: int
+    failed: int
+    budget_exhausted: bool
+    elapsed_seconds: float
+
+
+def synthetic_result(n_categories: int, horizon: int, seed: int = 0) -> dict:
+    """An optimal optimize_budget result with n categories over a horizon in months."""
+    rng = random.Random(seed)
+    allocation = {f"category_{i}": rng.uniform(50, 500) for i in range(n_categories)}
+    return _optimal_result(
+        rng.uniform(200, 2000),
+        allocation,
+        {"rent": 1500.0, "insurance": 200.0},
+        savings_goal=20000.0,
+        months_to_goal=horizon
+    )
+
+
+def legacy_render(model: type[BaseModel], build: Callable[[], BaseModel]) -> bytes:
+    adapter = TypeAdapter(model)
+    content = adapter.validate_python(build().model_dump())
+    return json.dumps(
+        adapter.dump_python(content, mode="json"),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode()
+
+
+def timed(fn: Callable[[], bytes], repeats: int) -> tuple[float, bytes]:
+    """Median milliseconds per call, and the last output."""
+    fn()  # warm-up
+    timings = []
+    body = b""
+    for _ in range(repeats):
+        start = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), body
+
+
+def payloads(horizons: list[int], batch_size: int, n_categories: int) -> list[tuple[str, Callable[[], bytes], Callable[[], bytes]]]:
+    """(label, before renderer, after renderer) for each representative payload."""
+    cases = []
+    for horizon in horizons:
+        result = synthetic_result(n_categories, horizon)
+        cases.append((
+            f"single, {horizon} months",
+            lambda result=result: legacy_render(LegacyOptimizationResponse, lambda: LegacyOptimizationResponse(**result)),
+            lambda result=result: FastJSONResponse(optimization_response_content(result)).body
+        ))
+
+    results = [synthetic_result(n_categories, 12, seed) for seed in range(batch_size)]
+    scenarios = [None] * batch_size  # any non-string marks a solved scenario
+    cases.append((
+        f"batch of {batch_size}, 12 months",
+        lambda: legacy_render(LegacyBatchScenarioResponse, lambda: LegacyBatchScenarioResponse(
+            results=[LegacyOptimizationResponse(**result) for result in results],
+            solved=batch_size,
+            failed=0,
+            budget_exhausted=False,
+            elapsed_seconds=0.0
+        )),
+        lambda: FastJSONResponse(batch_response(scenarios, results, 0.0)).body
+    ))
+    return cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--horizons", type=int, nargs="+", default=[12, 120, 360])
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{'payload':<26} {'before ms':>10} {'after ms':>9} {'before B':>9} {'after B':>9} "
+        f"{'gzip B':>8} {'br B':>8}"
+    )
+    for label, before, after in payloads(args.horizons, args.batch, args.categories):
+        repeats = max(1, args.repeats // 20) if label.startswith("batch") else args.repeats
+        before_ms, before_body = timed(before, repeats)
+        after_ms, after_body = timed(after, repeats)
+        gzip_size = len(gzip.compress(after_body, compresslevel=settings.RESPONSE_GZIP_LEVEL))
+        br_size = len(brotli.compress(after_body, quality=settings.RESPONSE_BROTLI_QUALITY))
+        print(
+            f"{label:<26} {before_ms:>10.3f} {after_ms:>9.3f} {len(before_body):>9} {len(after_body):>9} "
+            f"{gzip_size:>8} {br_size:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
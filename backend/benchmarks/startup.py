@@ -0,0 +1,102 @@
+"""
+Cold-boot time of the API: importing app.main, and spawning a uvicorn
+process until it answers its first request.
+
+Each run starts a fresh interpreter, so nothing is shared between runs. The
+import check also reports whether PuLP was loaded, which should only happen
+in solver worker processes.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+IMPORT_PROBE = (
+    "import sys, time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started, 'pulp' in sys.modules)"
+)
+
+
+def import_time() -> tuple[float, bool]:
+    """Seconds to import app.main in a fresh interpreter, and whether PuLP got imported."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), output[1] == "True"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, deadline: float) -> float | None:
+    """Poll url until it returns 200; the time it did, or None at the deadline."""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.01)
+    return None
+
+
+def time_to_first_request(timeout: float) -> tuple[float | None, float | None]:
+    """Seconds from spawning uvicorn until /health, then /ready, first return 200."""
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy()
+    )
+    try:
+        deadline = started + timeout
+        health = wait_for(f"{base}/health", deadline)
+        ready = wait_for(f"{base}/ready", deadline) if health is not None else None
+        return (
+            health - started if health is not None else None,
+            ready - started if ready is not None else None
+        )
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _summary(values: list[float | None]) -> str:
+    measured = [value for value in values if value is not None]
+    if not measured:
+        return "timed out"
+    missed = len(values) - len(measured)
+    suffix = f" ({missed} timed out)" if missed else ""
+    return f"median {statistics.median(measured):.3f}s, max {max(measured):.3f}s{suffix}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for each server")
+    args = parser.parse_args()
+
+    imports = [import_time() for _ in range(args.runs)]
+    boots = [time_to_first_request(args.timeout) for _ in range(args.runs)]
+
+    print(f"import app.main:        {_summary([seconds for seconds, _ in imports])}")
+    print(f"PuLP imported by app:   {any(pulp for _, pulp in imports)}")
+    print(f"spawn to first /health: {_summary([health for health, _ in boots])}")
+    print(f"spawn to first /ready:  {_summary([ready for _, ready in boots])}")
+
+
+if __name__ == "__main__":
+    main()
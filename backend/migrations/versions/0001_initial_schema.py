@@ -0,0 +1,95 @@
+"""Initial schema (tables previously created by Base.metadata.create_all)
+
+Databases created before migrations were introduced already have these
+tables; mark them as migrated with `alembic stamp 0001` before upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# JSONB on Postgres, plain JSON elsewhere (SQLite stand-ins)
+ResultJSON = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "budget_profiles",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("monthly_income", sa.Numeric(10, 2), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_budget_profiles_id", "budget_profiles", ["id"])
+
+    op.create_table(
+        "fixed_expenses",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("profile_id", sa.Integer(), sa.ForeignKey("budget_profiles.id"), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("amount", sa.Numeric(10, 2), nullable=False),
+    )
+    op.create_index("ix_fixed_expenses_id", "fixed_expenses", ["id"])
+
+    op.create_table(
+        "variable_expenses",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("profile_id", sa.Integer(), sa.ForeignKey("budget_profiles.id"), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("min_amount", sa.Numeric(10, 2), nullable=False),
+        sa.Column("max_amount", sa.Numeric(10, 2), nullable=False),
+    )
+    op.create_index("ix_variable_expenses_id", "variable_expenses", ["id"])
+
+    op.create_table(
+        "financial_goals",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("profile_id", sa.Integer(), sa.ForeignKey("budget_profiles.id"), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("target_amount", sa.Numeric(10, 2), nullable=False),
+        sa.Column("current_amount", sa.Numeric(10, 2)),
+        sa.Column("deadline", sa.Date()),
+        sa.Column("priority", sa.Integer()),
+    )
+    op.create_index("ix_financial_goals_id", "financial_goals", ["id"])
+
+    op.create_table(
+        "optimization_results",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("profile_id", sa.Integer(), sa.ForeignKey("budget_profiles.id"), nullable=False),
+        sa.Column("result_json", ResultJSON, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_optimization_results_id", "optimization_results", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("optimization_results")
+    op.drop_table("financial_goals")
+    op.drop_table("variable_expenses")
+    op.drop_table("fixed_expenses")
+    op.drop_table("budget_profiles")
+    op.drop_table("users")
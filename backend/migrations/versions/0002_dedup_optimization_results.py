@@ -0,0 +1,140 @@
+"""Content-addressed optimization solutions shared by result rows
+
+Moves result payloads out of optimization_results into optimization_solutions,
+stored once per distinct content hash, and backfills result_hash for existing
+rows. problem_hash stays NULL for them: their inputs were never recorded.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 10:00:00
+
+"""
+import hashlib
+import json
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# JSONB on Postgres, plain JSON elsewhere (SQLite stand-ins)
+ResultJSON = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+BATCH_SIZE = 1000
+
+solutions = sa.table(
+    "optimization_solutions",
+    sa.column("id", sa.Integer),
+    sa.column("content_hash", sa.String),
+    sa.column("result_json", ResultJSON),
+)
+results = sa.table(
+    "optimization_results",
+    sa.column("id", sa.Integer),
+    sa.column("result_json", ResultJSON),
+    sa.column("result_hash", sa.String),
+    sa.column("solution_id", sa.Integer),
+)
+
+
+def _content_hash(data: dict) -> str:
+    # Must match app.services.optimizer.content_hash
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def upgrade() -> None:
+    op.create_table(
+        "optimization_solutions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("result_json", ResultJSON, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_optimization_solutions_id", "optimization_solutions", ["id"])
+    op.create_index("ix_optimization_solutions_content_hash", "optimization_solutions", ["content_hash"], unique=True)
+
+    with op.batch_alter_table("optimization_results") as batch:
+        batch.add_column(sa.Column("solution_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("problem_hash", sa.String(length=64), nullable=True))
+        batch.add_column(sa.Column("result_hash", sa.String(length=64), nullable=True))
+
+    # Backfill: hash every payload, store each distinct one once
+    conn = op.get_bind()
+    solution_ids: dict[str, int] = {}
+    last_id = 0
+    total_rows = 0
+    while True:
+        rows = conn.execute(
+            sa.select(results.c.id, results.c.result_json)
+            .where(results.c.id > last_id)
+            .order_by(results.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        for row_id, result_json in rows:
+            digest = _content_hash(result_json)
+            if digest not in solution_ids:
+                solution_ids[digest] = conn.execute(
+                    solutions.insert()
+                    .values(content_hash=digest, result_json=result_json)
+                    .returning(solutions.c.id)
+                ).scalar_one()
+            conn.execute(
+                results.update()
+                .where(results.c.id == row_id)
+                .values(result_hash=digest, solution_id=solution_ids[digest])
+            )
+
+        total_rows += len(rows)
+        last_id = rows[-1][0]
+
+    logger.info("Backfilled %d optimization results into %d distinct solutions", total_rows, len(solution_ids))
+
+    with op.batch_alter_table("optimization_results") as batch:
+        batch.alter_column("solution_id", existing_type=sa.Integer(), nullable=False)
+        batch.alter_column("result_hash", existing_type=sa.String(length=64), nullable=False)
+        batch.create_foreign_key(
+            "fk_optimization_results_solution_id",
+            "optimization_solutions",
+            ["solution_id"],
+            ["id"],
+        )
+        batch.create_index("ix_optimization_results_problem_hash", ["problem_hash"])
+        batch.drop_column("result_json")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("optimization_results") as batch:
+        batch.add_column(sa.Column("result_json", ResultJSON, nullable=True))
+
+    conn = op.get_bind()
+    conn.execute(
+        results.update()
+        .values(
+            result_json=sa.select(solutions.c.result_json)
+            .where(solutions.c.id == results.c.solution_id)
+            .scalar_subquery()
+        )
+    )
+
+    with op.batch_alter_table("optimization_results") as batch:
+        batch.alter_column("result_json", existing_type=ResultJSON, nullable=False)
+        batch.drop_index("ix_optimization_results_problem_hash")
+        batch.drop_constraint("fk_optimization_results_solution_id", type_="foreignkey")
+        batch.drop_column("result_hash")
+        batch.drop_column("problem_hash")
+        batch.drop_column("solution_id")
+
+    op.drop_table("optimization_solutions")
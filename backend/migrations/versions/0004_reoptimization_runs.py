@@ -0,0 +1,40 @@
+"""Checkpoints for bulk re-optimization runs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reoptimization_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("optimization_mode", sa.String(length=20), nullable=False),
+        sa.Column("last_profile_id", sa.Integer(), nullable=False),
+        sa.Column("profiles_processed", sa.Integer(), nullable=False),
+        sa.Column("profiles_failed", sa.Integer(), nullable=False),
+        sa.Column("results_inserted", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_reoptimization_runs_id"), "reoptimization_runs", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_reoptimization_runs_id"), table_name="reoptimization_runs")
+    op.drop_table("reoptimization_runs")
@@ -0,0 +1,106 @@
+"""Summary columns and keyset index for optimization history
+
+Copies status, monthly_savings, months_to_goal and total_monthly_spending out
+of each result's payload so history listings can skip it, and indexes
+(profile_id, created_at DESC, id DESC) for newest-first keyset pagination.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 14:00:00
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# JSONB on Postgres, plain JSON elsewhere (SQLite stand-ins)
+ResultJSON = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+BATCH_SIZE = 1000
+
+solutions = sa.table(
+    "optimization_solutions",
+    sa.column("id", sa.Integer),
+    sa.column("result_json", ResultJSON),
+)
+results = sa.table(
+    "optimization_results",
+    sa.column("solution_id", sa.Integer),
+    sa.column("status", sa.String),
+    sa.column("monthly_savings", sa.Numeric),
+    sa.column("months_to_goal", sa.Float),
+    sa.column("total_monthly_spending", sa.Numeric),
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("optimization_results") as batch:
+        batch.add_column(sa.Column("status", sa.String(length=20), nullable=True))
+        batch.add_column(sa.Column("monthly_savings", sa.Numeric(10, 2), nullable=True))
+        batch.add_column(sa.Column("months_to_goal", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("total_monthly_spending", sa.Numeric(10, 2), nullable=True))
+
+    # Backfill once per distinct payload; result rows share solutions
+    conn = op.get_bind()
+    last_id = 0
+    total = 0
+    while True:
+        rows = conn.execute(
+            sa.select(solutions.c.id, solutions.c.result_json)
+            .where(solutions.c.id > last_id)
+            .order_by(solutions.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        conn.execute(
+            results.update()
+            .where(results.c.solution_id == sa.bindparam("solution_id_"))
+            .values(
+                status=sa.bindparam("status_"),
+                monthly_savings=sa.bindparam("monthly_savings_"),
+                months_to_goal=sa.bindparam("months_to_goal_"),
+                total_monthly_spending=sa.bindparam("total_monthly_spending_"),
+            ),
+            [
+                {
+                    "solution_id_": solution_id,
+                    "status_": payload.get("status"),
+                    "monthly_savings_": payload.get("monthly_savings"),
+                    "months_to_goal_": payload.get("months_to_goal"),
+                    "total_monthly_spending_": payload.get("total_monthly_spending"),
+                }
+                for solution_id, payload in rows
+            ]
+        )
+        total += len(rows)
+        last_id = rows[-1][0]
+
+    logger.info("Backfilled history summaries from %d distinct solutions", total)
+
+    op.create_index(
+        "ix_optimization_results_profile_history",
+        "optimization_results",
+        ["profile_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_optimization_results_profile_history", table_name="optimization_results")
+    with op.batch_alter_table("optimization_results") as batch:
+        batch.drop_column("total_monthly_spending")
+        batch.drop_column("months_to_goal")
+        batch.drop_column("monthly_savings")
+        batch.drop_column("status")
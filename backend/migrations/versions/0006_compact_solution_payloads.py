@@ -0,0 +1,197 @@
+"""Compact storage form for optimization solution payloads
+
+Re-encodes every optimization_solutions.result_json in the versioned compact
+form (format version 1 of app.services.result_codec) and reports the JSON
+bytes reclaimed. The codec is copied here as it stood at version 1, so the
+migration keeps working however the application module changes later.
+content_hash is of the full form and does not change. Postgres only returns
+the freed space to the OS after a VACUUM of optimization_solutions.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 15:00:00
+
+"""
+import json
+import logging
+import math
+from typing import Callable, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# JSONB on Postgres, plain JSON elsewhere (SQLite stand-ins)
+ResultJSON = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+BATCH_SIZE = 1000
+
+solutions = sa.table(
+    "optimization_solutions",
+    sa.column("id", sa.Integer),
+    sa.column("result_json", ResultJSON),
+)
+
+
+# Format version 1 of app.services.result_codec, frozen for this migration
+FORMAT_VERSION = 1
+
+_EXPANDED_KEYS = ("spending_allocation", "fixed_expenses", "projected_savings", "income_allocation")
+
+_KEY_ORDER = (
+    "status", "message", "monthly_savings", "spending_allocation", "total_monthly_spending",
+    "months_to_goal", "projected_savings", "fixed_expenses", "total_fixed_expenses", "income_allocation"
+)
+
+
+def compact_result(result: dict) -> dict:
+    if "v" in result:
+        return result
+    if result.get("status") != "optimal":
+        return {"v": FORMAT_VERSION, **result}
+
+    compact = {"v": FORMAT_VERSION}
+    compact.update((key, value) for key, value in result.items() if key not in _EXPANDED_KEYS)
+
+    categories = list(dict.fromkeys([*result["spending_allocation"], *result["fixed_expenses"]]))
+    index = {cat: i for i, cat in enumerate(categories)}
+    compact["categories"] = categories
+    compact["spending"] = _columns(result["spending_allocation"], index)
+    compact["fixed"] = _columns(result["fixed_expenses"], index)
+
+    series = result["projected_savings"]
+    rate = _series_rate(series)
+    if rate is not None:
+        compact["savings_series"] = [len(series), rate]
+    else:
+        compact["projected_savings"] = series
+
+    if result["income_allocation"] != _income_allocation(compact, result["income_allocation"]["variable_expenses"]):
+        compact["income_allocation"] = result["income_allocation"]
+    else:
+        compact["variable_total"] = result["income_allocation"]["variable_expenses"]
+
+    return compact
+
+
+def expand_result(payload: dict) -> dict:
+    if "v" not in payload:
+        return payload
+
+    compact = dict(payload)
+    compact.pop("v")
+    if compact.get("status") != "optimal":
+        return compact
+
+    categories = compact.pop("categories")
+    spending = compact.pop("spending")
+    fixed = compact.pop("fixed")
+    if "savings_series" in compact:
+        horizon, rate = compact.pop("savings_series")
+        projected_savings = [round(rate * i, 2) for i in range(1, horizon + 1)]
+    else:
+        projected_savings = compact.pop("projected_savings")
+    if "variable_total" in compact:
+        income_allocation = _income_allocation(compact, compact.pop("variable_total"))
+    else:
+        income_allocation = compact.pop("income_allocation")
+
+    result = {
+        **compact,
+        "spending_allocation": {categories[i]: amount for i, amount in zip(*spending)},
+        "projected_savings": projected_savings,
+        "fixed_expenses": {categories[i]: amount for i, amount in zip(*fixed)},
+        "income_allocation": income_allocation
+    }
+    ordered = {key: result.pop(key) for key in _KEY_ORDER if key in result}
+    return {**ordered, **result}
+
+
+def _columns(amounts: dict[str, float], index: dict[str, int]) -> list[list]:
+    return [[index[cat] for cat in amounts], list(amounts.values())]
+
+
+def _series_rate(series: list[float]) -> float | None:
+    if not series:
+        return 0.0
+    low = max((value - 0.005) / i for i, value in enumerate(series, 1))
+    high = min((value + 0.005) / i for i, value in enumerate(series, 1))
+    if low > high:
+        return None
+    rate = (low + high) / 2
+    if not math.isfinite(rate) or any(round(rate * i, 2) != value for i, value in enumerate(series, 1)):
+        return None
+    return rate
+
+
+def _income_allocation(compact: dict, variable_total: float) -> dict:
+    return {
+        "fixed_expenses": compact.get("total_fixed_expenses"),
+        "variable_expenses": variable_total,
+        "savings": compact.get("monthly_savings")
+    }
+
+
+def _payload_size(payload: dict) -> int:
+    return len(json.dumps(payload, separators=(",", ":")).encode())
+
+
+def _convert(encode: Callable[[dict], dict]) -> tuple[int, int, int]:
+    """Re-encode every payload in batches; returns (rows, bytes before, bytes after)."""
+    conn = op.get_bind()
+    last_id = 0
+    total_rows = 0
+    size_before = 0
+    size_after = 0
+    while True:
+        rows = conn.execute(
+            sa.select(solutions.c.id, solutions.c.result_json)
+            .where(solutions.c.id > last_id)
+            .order_by(solutions.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        updates = []
+        for solution_id, payload in rows:
+            encoded = encode(payload)
+            size_before += _payload_size(payload)
+            size_after += _payload_size(encoded)
+            if encoded != payload:
+                updates.append({"id_": solution_id, "result_json_": encoded})
+        if updates:
+            conn.execute(
+                solutions.update()
+                .where(solutions.c.id == sa.bindparam("id_"))
+                .values(result_json=sa.bindparam("result_json_")),
+                updates
+            )
+
+        total_rows += len(rows)
+        last_id = rows[-1][0]
+
+    return total_rows, size_before, size_after
+
+
+def upgrade() -> None:
+    total_rows, size_before, size_after = _convert(compact_result)
+    reclaimed = size_before - size_after
+    percent = 100 * reclaimed / size_before if size_before else 0
+    logger.info(
+        "Compacted %d solution payloads: %d -> %d bytes (%d bytes, %.1f%% reclaimed)",
+        total_rows, size_before, size_after, reclaimed, percent
+    )
+
+
+def downgrade() -> None:
+    total_rows, _, size_after = _convert(expand_result)
+    logger.info("Expanded %d solution payloads to %d bytes", total_rows, size_after)
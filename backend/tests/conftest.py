@@ -0,0 +1,59 @@
+import os
+import tempfile
+
+# Settings are read at import time, so configure before anything imports app
+_scratch = tempfile.mkdtemp(prefix="finance-optimizer-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch, 'test.db')}"
+os.environ["SOLVER_POOL_SIZE"] = "0"  # solve in the request threadpool
+os.environ["JOB_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["TRACING_ENABLED"] = "false"
+os.environ["SLOW_SOLVE_SECONDS"] = "0"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, engine
+from app.main import app
+from app.models import budget, job, reoptimization, user  # noqa: F401  (register models on Base.metadata)
+
+# A feasible profile with one goal
+PROFILE = {
+    "monthly_income": 5000.0,
+    "fixed_expenses": [
+        {"category": "rent", "amount": 1500.0},
+        {"category": "insurance", "amount": 200.0}
+    ],
+    "variable_expenses": [
+        {"category": "groceries", "min_amount": 300.0, "max_amount": 600.0},
+        {"category": "dining", "min_amount": 50.0, "max_amount": 300.0},
+        {"category": "transport", "min_amount": 100.0, "max_amount": 250.0}
+    ],
+    "financial_goals": [{"name": "Emergency fund", "target_amount": 10000.0}]
+}
+
+
+@pytest.fixture(scope="session")
+def client():
+    Base.metadata.create_all(engine)
+    with TestClient(app) as test_client:
+        yield test_client
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def auth_headers(client, request):
+    """Bearer headers of a freshly registered user, unique per test."""
+    email = f"{request.node.name.replace('[', '-').rstrip(']')}@example.com"
+    password = "test-password"
+    assert client.post("/api/auth/register", json={"email": email, "password": password}).status_code == 201
+    response = client.post("/api/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def profile_headers(client, auth_headers):
+    """auth_headers of a user who has saved PROFILE."""
+    assert client.post("/api/budget/", json=PROFILE, headers=auth_headers).status_code == 201
+    return auth_headers
@@ -0,0 +1,35 @@
+from tests.conftest import PROFILE
+
+MODES = ("max_savings", "balanced", "fastest_goal")
+
+
+def test_history_cursor_walks_every_page(client, profile_headers):
+    # Results stored within the same second share created_at, so paging relies on the id tie-break
+    for income in (PROFILE["monthly_income"], PROFILE["monthly_income"] + 750):
+        profile = {**PROFILE, "monthly_income": income}
+        assert client.post("/api/budget/", json=profile, headers=profile_headers).status_code == 201
+        for mode in MODES:
+            response = client.post("/api/optimize/", json={"optimization_mode": mode}, headers=profile_headers)
+            assert response.status_code == 200
+
+    listing = client.get("/api/budget/history", params={"limit": 100}, headers=profile_headers).json()
+    expected = [item["id"] for item in listing["items"]]
+    assert len(expected) >= 2
+    assert listing["next_cursor"] is None
+
+    walked = []
+    params = {"limit": 1}
+    while True:
+        page = client.get("/api/budget/history", params=params, headers=profile_headers).json()
+        walked.extend(item["id"] for item in page["items"])
+        assert len(walked) <= len(expected), "pagination did not advance"
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert walked == expected
+
+
+def test_history_rejects_malformed_cursor(client, profile_headers):
+    response = client.get("/api/budget/history", params={"cursor": "not-a-cursor"}, headers=profile_headers)
+    assert response.status_code == 400
@@ -0,0 +1,70 @@
+"""
+Statements issued per request on the hot endpoints.
+
+Counted with a before_cursor_execute listener on the request engine, with
+the principal cache cleared so each count includes the one user lookup of
+authentication. A regression to lazy loading or per-row queries fails here.
+"""
+import contextlib
+from typing import Iterator
+
+from sqlalchemy import event
+
+from app.core.database import async_engine
+from app.services.optimizer import result_cache
+from app.services.principals import principal_cache
+from tests.conftest import PROFILE
+
+
+@contextlib.contextmanager
+def count_statements() -> Iterator[list[str]]:
+    statements: list[str] = []
+    principal_cache.clear()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_get_budget_profile(client, profile_headers):
+    with count_statements() as statements:
+        response = client.get("/api/budget/", headers=profile_headers)
+    assert response.status_code == 200
+    assert len(statements) == 2, statements
+
+
+def test_optimize_solve(client, profile_headers):
+    # An income no other test uses, so no stored result of this problem exists
+    profile = {**PROFILE, "monthly_income": 5432.1}
+    assert client.post("/api/budget/", json=profile, headers=profile_headers).status_code == 201
+    result_cache.clear()
+    with count_statements() as statements:
+        response = client.post("/api/optimize/", json={"optimization_mode": "max_savings"}, headers=profile_headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "optimal"
+    # The solution insert runs in a savepoint (SAVEPOINT, INSERT, RELEASE) to survive a concurrent duplicate
+    assert len(statements) == 9, statements
+
+
+def test_optimize_stored_result(client, profile_headers):
+    request = {"optimization_mode": "balanced"}
+    assert client.post("/api/optimize/", json=request, headers=profile_headers).status_code == 200
+    with count_statements() as statements:
+        response = client.post("/api/optimize/", json=request, headers=profile_headers)
+    assert response.status_code == 200
+    assert len(statements) == 4, statements
+
+
+def test_recommendations(client, profile_headers):
+    response = client.post("/api/optimize/", json={"optimization_mode": "max_savings"}, headers=profile_headers)
+    assert response.status_code == 200
+    with count_statements() as statements:
+        response = client.get("/api/optimize/recommendations", headers=profile_headers)
+    assert response.status_code == 200
+    assert "Run an optimization first" not in response.json()[0]
+    assert len(statements) == 3, statements
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+from app.core.database import SessionLocal
+from app.models.budget import OptimizationResult
+from app.models.reoptimization import ReoptimizationRun
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cli_reoptimizes_seeded_profiles(profile_headers):
+    completed = subprocess.run(
+        [sys.executable, "-m", "app.services.reoptimize", "--workers", "0", "--chunk-size", "1", "--restart"],
+        cwd=BACKEND_DIR,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    assert completed.returncode == 0, completed.stderr
+
+    with SessionLocal() as db:
+        run = db.query(ReoptimizationRun).order_by(ReoptimizationRun.id.desc()).first()
+        assert run.status == "completed"
+        assert run.profiles_processed >= 1
+        assert run.profiles_failed == 0
+        assert db.query(OptimizationResult).count() >= 1
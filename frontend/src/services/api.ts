@@ -80,8 +80,10 @@ class ApiService {
   }
 
   async getOptimizationHistory(): Promise<OptimizationResponse[]> {
-    const response = await this.client.get<any[]>('/api/budget/history');
-    return response.data.map(item => item.result_json);
+    const response = await this.client.get<{ items: any[] }>('/api/budget/history', {
+      params: { include_result: true },
+    });
+    return response.data.items.map(item => item.result_json);
   }
 
   // Optimization endpoints